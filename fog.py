@@ -0,0 +1,153 @@
+import pygame
+
+FOG_COLOR = (0, 0, 0, 150)  # Semi-transparent black
+CLEAR = (0, 0, 0, 0)
+VISION_RADIUS = 5  # In tiles
+
+
+def line_offsets(dx, dy):
+    """Bresenham tiles strictly between (0, 0) and (dx, dy)."""
+    steps = []
+    x, y = 0, 0
+    sx = 1 if dx > 0 else -1
+    sy = 1 if dy > 0 else -1
+    adx, ady = abs(dx), abs(dy)
+    err = adx - ady
+    while True:
+        e2 = 2 * err
+        if e2 > -ady:
+            err -= ady
+            x += sx
+        if e2 < adx:
+            err += adx
+            y += sy
+        if (x, y) == (dx, dy):
+            return steps
+        steps.append((x, y))
+
+
+class VisibilityTable:
+    """Tile-level line of sight within a radius, computed at most once per tile per maze.
+
+    The rays are translation-invariant, so each ray's Bresenham tiles are built once
+    up front as a bitmask over the (2r+1)-square window around the viewer. A tile's
+    visible set then takes one window of wall bits (a shift and mask per row) and
+    one AND per ray.
+    """
+
+    def __init__(self, maze, radius=VISION_RADIUS):
+        self.maze = maze
+        self.radius = radius
+        self.width = width = 2 * radius + 1
+        self.rays = []
+        for dy in range(-radius, radius + 1):
+            for dx in range(-radius, radius + 1):
+                if dx * dx + dy * dy <= radius * radius:
+                    mask = 0
+                    for ox, oy in line_offsets(dx, dy):
+                        mask |= 1 << ((oy + radius) * width + ox + radius)
+                    self.rays.append((dx, dy, mask))
+        # Bit x of wall_rows[y] is set where maze[y][x] blocks sight
+        self.wall_rows = [sum(1 << x for x, value in enumerate(row) if value != 0) for row in maze]
+        self.cache = {}
+        self._unvisited = ((x, y) for y, row in enumerate(maze) for x, value in enumerate(row) if value == 0)
+
+    def visible(self, tile):
+        """Frozen set of (x, y) tiles visible from tile; walls are visible but block what's behind them."""
+        tiles = self.cache.get(tile)
+        if tiles is None:
+            tiles = self.cache[tile] = frozenset(self._trace(tile))
+        return tiles
+
+    def _trace(self, tile):
+        rows, cols = len(self.maze), len(self.maze[0])
+        radius, width = self.radius, self.width
+        x0, y0 = tile
+        window_mask = (1 << width) - 1
+        shift = x0 - radius
+        walls = 0
+        for i, y in enumerate(range(y0 - radius, y0 + radius + 1)):
+            if 0 <= y < rows:
+                row = self.wall_rows[y] >> shift if shift >= 0 else self.wall_rows[y] << -shift
+                walls |= (row & window_mask) << (i * width)
+        for dx, dy, mask in self.rays:
+            x, y = x0 + dx, y0 + dy
+            if 0 <= x < cols and 0 <= y < rows and not walls & mask:
+                yield (x, y)
+
+    def precompute(self, max_tiles=None):
+        """Fill the table for every walkable tile, at most max_tiles per call.
+
+        Returns True once every walkable tile is done, so a caller can spread a
+        big maze over several frames instead of stalling on one.
+        """
+        for count, tile in enumerate(self._unvisited):
+            self.visible(tile)
+            if max_tiles is not None and count + 1 >= max_tiles:
+                return False
+        return True
+
+
+class FogOfWar:
+    """Fog overlay that is only repainted where visibility changed.
+
+    The overlay holds one pixel per tile and is allocated once; when a player steps
+    onto a new tile only the tiles entering or leaving view are repainted. Drawing
+    scales just the tiles under the camera into a reused window-sized surface, so
+    the per-frame cost depends on the window, not the maze.
+    """
+
+    def __init__(self, maze, tile_size, radius=VISION_RADIUS, color=FOG_COLOR):
+        self.tile_size = tile_size
+        self.color = color
+        self.table = VisibilityTable(maze, radius)
+        self.viewer_tiles = []
+        self.seen_by = {}  # (x, y) -> number of players that can see it
+        self.rows, self.cols = len(maze), len(maze[0])
+        self.overlay = pygame.Surface((self.cols, self.rows), pygame.SRCALPHA)
+        self.overlay.fill(color)
+        self.scaled = None  # Window-sized blit source, reused across frames
+
+    def update(self, viewer_tiles):
+        """Move the clear areas to follow the players; a no-op unless someone changed tile."""
+        viewer_tiles = list(viewer_tiles)
+        if viewer_tiles == self.viewer_tiles:
+            return
+
+        dirty = set()
+        for tile in self.viewer_tiles:
+            for seen in self.table.visible(tile):
+                count = self.seen_by[seen] - 1
+                if count:
+                    self.seen_by[seen] = count
+                else:
+                    del self.seen_by[seen]
+                    dirty.add(seen)
+        for tile in viewer_tiles:
+            for seen in self.table.visible(tile):
+                count = self.seen_by.get(seen, 0)
+                if not count:
+                    dirty.add(seen)
+                self.seen_by[seen] = count + 1
+        self.viewer_tiles = viewer_tiles
+
+        for x, y in dirty:
+            self.overlay.set_at((x, y), CLEAR if (x, y) in self.seen_by else self.color)
+
+    def is_visible(self, tile):
+        return tile in self.seen_by
+
+    def draw(self, surface, offset=(0, 0)):
+        size = self.tile_size
+        view_width, view_height = surface.get_size()
+        # Fixed-size window of tiles covering the view (+1 for partially visible edge tiles)
+        tiles_w = min(self.cols, view_width // size + 2)
+        tiles_h = min(self.rows, view_height // size + 2)
+        x0 = min(max(offset[0] // size, 0), self.cols - tiles_w)
+        y0 = min(max(offset[1] // size, 0), self.rows - tiles_h)
+
+        scaled_size = (tiles_w * size, tiles_h * size)
+        if self.scaled is None or self.scaled.get_size() != scaled_size:
+            self.scaled = pygame.Surface(scaled_size, pygame.SRCALPHA)
+        pygame.transform.scale(self.overlay.subsurface((x0, y0, tiles_w, tiles_h)), scaled_size, self.scaled)
+        surface.blit(self.scaled, (x0 * size - offset[0], y0 * size - offset[1]))
@@ -0,0 +1,227 @@
+import random
+from geometry import Rect
+from player import Player
+from ghosts2 import Ghost, request_trained_path
+from search_agents import cooperative_astar
+from gate import Gate
+from occupancy import OccupancyGrid
+from maze_utils import (build_cage_walls, find_nearest_valid_position, handle_teleporters,
+                        initial_pellets, new_maze)
+
+DIRECTIONS = ['right', 'left', 'up', 'down']
+
+# Player actions: index into the keys_pressed tuple handed to Player.move
+NOOP, UP, DOWN, LEFT, RIGHT = range(5)
+ACTION_KEYS = {'up': UP, 'down': DOWN, 'left': LEFT, 'right': RIGHT}
+ACTION_PRESSES = [tuple(i == a for i in range(5)) for a in range(5)]
+
+# Placeholder animation frames so Player/Ghost animation counters work without a display
+HEADLESS_FRAMES = {d: [None] for d in DIRECTIONS}
+HEADLESS_GHOST_FRAMES = {name: HEADLESS_FRAMES for name in ('blinky', 'inky', 'pinky', 'clyde')}
+
+REGENERATE_TICKS = 300  # main.py regenerates every 30 seconds at 100ms per tick
+
+# Which Pac-Man each ghost id chases when planned cooperatively (index into players)
+GHOST_TARGETS = {1: 0, 2: 1, 3: 0, 4: 1, 5: 0}
+# Behavior ids for the four ghost slots (Blinky, Inky, Pinky, Clyde sprites), as in main.py.
+# Any number of ids works: ghosts past the fourth reuse the sprites in turn and start inside the cage.
+GHOST_IDS = (2, 4, 1, 3)
+GHOST_SPRITES = ('blinky', 'inky', 'pinky', 'clyde')
+PLAN_WINDOW = 8
+# Ticks after a maze appears before Inky gets its trained path. The path trains on a background
+# thread meanwhile; handing it over on a fixed tick keeps seeded games reproducible.
+PATH_READY_TICKS = 5
+
+
+class Game:
+    """Headless game state and tick logic, mirroring the main.py loop without any rendering."""
+
+    def __init__(self, rows=21, cols=21, tile_size=25, seed=None, regenerate_ticks=REGENERATE_TICKS,
+                 player_frames=(HEADLESS_FRAMES, HEADLESS_FRAMES), ghost_frames=HEADLESS_GHOST_FRAMES,
+                 cooperative=False, ghost_ids=GHOST_IDS, build=True, regenerate_offset=0):
+        """build=False leaves out the maze, players and ghosts, for a caller that supplies
+        its own maze through _populate (snapshot.loads restoring a saved game).
+        regenerate_offset delays every maze regeneration by that many ticks, so a server
+        running many games can keep them from all regenerating on the same tick."""
+        self.rows = rows
+        self.cols = cols
+        self.tile_size = tile_size
+        self.regenerate_ticks = regenerate_ticks
+        self.regenerate_offset = regenerate_offset
+        self.player_frames = player_frames
+        self.ghost_frames = ghost_frames
+        self.cooperative = cooperative  # Plan escaped ghosts jointly instead of per-ghost search
+        self.ghost_ids = ghost_ids
+        if build:
+            self.reset(seed)
+        else:
+            self._start_level(seed)
+
+    def reset(self, seed=None):
+        self._start_level(seed)
+        maze = self._build_maze()
+        self._populate(maze, initial_pellets(maze))
+
+    def _start_level(self, seed=None):
+        """Per-level state that doesn't depend on the maze."""
+        self.rng = random.Random(seed)
+        self.tick_count = 0
+        self.maze_tick = 0  # Tick the current maze appeared on
+        self.capture_tick = None
+        self.consumed_pellets = set()
+
+    def _populate(self, maze, pellets):
+        """Gate, players, ghosts and occupancy grids at their starting spots on maze."""
+        self.maze = maze
+        self.pellets = pellets
+        cols, rows, tile = self.cols, self.rows, self.tile_size
+        # Gate tile sits one row below the cage center, as in main.py
+        gate_rect = Rect(cols // 2 * tile, (rows // 2 + 1) * tile, tile, tile)
+        self.gate = Gate(gate_rect, None, self.maze, tile)
+
+        self.spawns = [(1, 1), (cols - 2, rows - 2)]
+        self.players = [
+            Player(1, 1, self.player_frames[0], self.maze, tile, ACTION_KEYS, self.pellets),
+            Player(cols - 2, rows - 2, self.player_frames[1], self.maze, tile, ACTION_KEYS, self.pellets),
+        ]
+        self.ghosts = [
+            Ghost(ghost_id, x, y, self.ghost_frames[GHOST_SPRITES[i % 4]], tile, self.maze, self.gate, self.rng)
+            for i, (ghost_id, (x, y)) in enumerate(zip(self.ghost_ids, self.ghost_spawns()))
+        ]
+        for ghost in self.ghosts:
+            ghost.gate_rect = gate_rect
+
+        # Who stands where, for collisions and player blocking
+        self.player_grid = OccupancyGrid()
+        self.ghost_grid = OccupancyGrid()
+        for player in self.players:
+            player.occupancy = self.player_grid
+            player.sync_occupancy()
+        for ghost in self.ghosts:
+            ghost.occupancy = self.ghost_grid
+            ghost.sync_occupancy()
+        self.path_future = None
+        self._request_trained_path()
+
+    def _request_trained_path(self):
+        """Start fetching Inky's path for the current maze; tick() hands it over when due."""
+        if self.path_future is not None:
+            self.path_future.cancel()
+        for ghost in self.ghosts:
+            ghost.trained_path = []
+            ghost.path_index = 0
+        self.path_future = request_trained_path(self.maze) if 4 in self.ghost_ids else None
+
+    def ghost_spawns(self):
+        """Starting tile per ghost: the four classic spots, then round the cage interior."""
+        cols, rows = self.cols, self.rows
+        mid_c, mid_r = cols // 2, rows // 2
+        classic = [(mid_c, mid_r), (mid_c - 1, mid_r), (mid_c + 1, mid_r), (int(cols // 2 - 1.7), int(rows // 2 - 0.75))]
+        interior = [(c, r) for r in (mid_r, mid_r + 1) for c in range(mid_c - 1, mid_c + 3)]
+        return [classic[i] if i < 4 else interior[i % len(interior)] for i in range(len(self.ghost_ids))]
+
+    def _build_maze(self):
+        maze = new_maze(self.rows, self.cols, self.rng)
+        build_cage_walls(maze)
+        return maze
+
+    @property
+    def done(self):
+        return not self.pellets or not any(p.alive for p in self.players)
+
+    @property
+    def pellets_eaten(self):
+        return sum(p.score for p in self.players) // 10
+
+    def regenerate_maze(self):
+        """Swap in a fresh maze, keeping everyone near their current tiles."""
+        self.maze = self._build_maze()
+        self.maze_tick = self.tick_count
+        self.pellets = initial_pellets(self.maze, self.consumed_pellets)
+        self.gate.maze = self.maze
+
+        for player in self.players:
+            player.maze = self.maze
+            player.pellets = self.pellets
+            player.x, player.y = find_nearest_valid_position(self.maze, player.x, player.y)
+            player.sync_occupancy()
+        for ghost in self.ghosts:
+            ghost.maze = self.maze
+            if ghost.has_escaped:
+                x, y = find_nearest_valid_position(self.maze, *ghost.tile_position())
+                ghost.rect.x, ghost.rect.y = x * self.tile_size, y * self.tile_size
+                ghost.sync_occupancy()
+        self._request_trained_path()
+
+    def respawn_players(self):
+        """Bring caught players back at (or near) their spawn tiles."""
+        for player, (x, y) in zip(self.players, self.spawns):
+            if not player.alive:
+                player.alive = True
+                player.x, player.y = find_nearest_valid_position(self.maze, x, y)
+                player.sync_occupancy()
+
+    def tick(self, action1=NOOP, action2=NOOP):
+        """Advance the game one frame with the given player actions."""
+        since = self.tick_count - self.regenerate_offset
+        if self.regenerate_ticks and since > 0 and since % self.regenerate_ticks == 0:
+            self.regenerate_maze()
+        if self.path_future is not None and self.tick_count >= self.maze_tick + PATH_READY_TICKS:
+            path = self.path_future.result()  # Normally long done; waits if the trainer fell behind
+            self.path_future = None
+            for ghost in self.ghosts:
+                if ghost.id == 4:
+                    ghost.trained_path = path
+
+        player1, player2 = self.players
+        for player in self.players:
+            handle_teleporters(player)
+            player.sync_occupancy()
+        for ghost in self.ghosts:
+            handle_teleporters(ghost)
+
+        if player1.alive:
+            player1.move(ACTION_PRESSES[action1], None)
+        if player2.alive:
+            player2.move(ACTION_PRESSES[action2], None)
+
+        for player in self.players:
+            player.update()
+            if player.alive:
+                player.eat_pellet(self.consumed_pellets)
+
+        pacman_positions = [(player1.x, player1.y), (player2.x, player2.y)]
+        if self.cooperative:
+            self.plan_ghosts(pacman_positions)
+        for ghost in self.ghosts:
+            ghost.update(self.ghosts, pacman_positions)
+
+        self.gate.update_gate_visuals()
+        self.check_collisions()
+        self.tick_count += 1
+
+    def plan_ghosts(self, pacman_positions):
+        """Hand every escaped ghost its next tile from one cooperative A* pass."""
+        planned = [g for g in self.ghosts if g.has_escaped]
+        if not planned:
+            return
+        starts = [g.tile_position() for g in planned]
+        goals = [pacman_positions[GHOST_TARGETS.get(g.id, 0)] for g in planned]
+        for ghost, move in zip(planned, cooperative_astar(starts, goals, self.maze, PLAN_WINDOW)):
+            ghost.planned_move = move
+
+    def check_collisions(self):
+        """Resolve ghost/Pac-Man contact with one grid lookup per player."""
+        for player in self.players:
+            if not player.alive:
+                continue
+            for ghost in self.ghost_grid.at((player.x, player.y)):
+                if not ghost.has_escaped or not getattr(ghost, 'alive', True):
+                    continue
+                if player.power_up:
+                    player.kill_ghost(ghost)
+                else:
+                    player.be_killed()
+                    if self.capture_tick is None:
+                        self.capture_tick = self.tick_count
+                    break
@@ -0,0 +1,46 @@
+from geometry import Rect
+
+GATE_COLOR = (255, 255, 255)
+GATE_HIT_LIMIT = 4
+
+
+class Gate:
+    def __init__(self, gate_rect, win, maze, tile_size, hit_limit=GATE_HIT_LIMIT):
+        self.gate_rect = gate_rect
+        self.win = win  # None when running headless
+        self.maze = maze
+        self.tile_size = tile_size
+        self.hit_limit = hit_limit
+        self.hits = 0
+        self.broken = False
+        self.flicker_timer = 0
+        self.ghosts_escaped = 0
+
+        # Cage interior in pixels, centered on the maze like reserve_ghost_box()
+        rows, cols = len(maze), len(maze[0])
+        mid_r, mid_c = rows // 2, cols // 2
+        self.cage_rect = Rect((mid_c - 2) * tile_size, (mid_r - 1) * tile_size,
+                                     5 * tile_size, 3 * tile_size)
+
+    def hit(self):
+        """Register a ghost bumping the gate; it breaks after hit_limit bumps."""
+        if self.broken:
+            return
+        self.hits += 1
+        if self.hits >= self.hit_limit:
+            self.broken = True
+
+    def update_gate_visuals(self):
+        if self.flicker_timer > 0:
+            self.flicker_timer -= 1
+        if self.win is not None and not self.broken:
+            self.draw(self.win)
+
+    def draw(self, surface):
+        if self.broken:
+            return
+        # Flicker while being attacked
+        if self.flicker_timer % 2 == 1:
+            return
+        import pygame  # Rendering only
+        pygame.draw.line(surface, GATE_COLOR, self.gate_rect.bottomleft, self.gate_rect.bottomright, 2)
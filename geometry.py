@@ -0,0 +1,85 @@
+import math
+
+
+def _to_int(value):
+    # pygame.Rect rounds half away from zero when handed floats
+    if isinstance(value, int):
+        return value
+    return int(math.copysign(math.floor(abs(value) + 0.5), value))
+
+
+class Rect:
+    """The slice of pygame.Rect the game logic uses, so headless code never imports pygame.
+
+    Coordinates are kept as ints and float assignments round the same way pygame does,
+    so ghosts move identically with or without a display.
+    """
+    __slots__ = ('_x', '_y', 'width', 'height')
+
+    def __init__(self, x, y, width, height):
+        self._x = _to_int(x)
+        self._y = _to_int(y)
+        self.width = _to_int(width)
+        self.height = _to_int(height)
+
+    @property
+    def x(self):
+        return self._x
+
+    @x.setter
+    def x(self, value):
+        self._x = _to_int(value)
+
+    @property
+    def y(self):
+        return self._y
+
+    @y.setter
+    def y(self, value):
+        self._y = _to_int(value)
+
+    @property
+    def topleft(self):
+        return (self._x, self._y)
+
+    @topleft.setter
+    def topleft(self, pos):
+        self.x, self.y = pos
+
+    @property
+    def centerx(self):
+        return self._x + self.width // 2
+
+    @property
+    def centery(self):
+        return self._y + self.height // 2
+
+    @property
+    def center(self):
+        return (self.centerx, self.centery)
+
+    @property
+    def bottomleft(self):
+        return (self._x, self._y + self.height)
+
+    @property
+    def bottomright(self):
+        return (self._x + self.width, self._y + self.height)
+
+    def inflate(self, dx, dy):
+        return Rect(self._x - dx // 2, self._y - dy // 2, self.width + dx, self.height + dy)
+
+    def collidepoint(self, *point):
+        px, py = point[0] if len(point) == 1 else point
+        return self._x <= px < self._x + self.width and self._y <= py < self._y + self.height
+
+    def __iter__(self):
+        return iter((self._x, self._y, self.width, self.height))
+
+    def __eq__(self, other):
+        if not isinstance(other, (Rect, tuple, list)):
+            return NotImplemented
+        return tuple(self) == tuple(other)
+
+    def __repr__(self):
+        return f"<Rect({self._x}, {self._y}, {self.width}, {self.height})>"
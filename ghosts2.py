@@ -1,15 +1,55 @@
-import pygame
+import logging
+import math
+import os
 import random
+from concurrent.futures import Future, ThreadPoolExecutor
+from geometry import Rect
 from search_agents import bfs, astar, minimax_choose_move
+from mcts import MCTSPlanner, SimState
+from maze_utils import ghost_exit_tile
+from policy_store import load_library, maze_hash
+from train_genetic_algorithm import TRAINED_TARGET, train_path
+
+log = logging.getLogger(__name__)
+IN_PLAY_GENERATIONS = 30  # GA generations when a new maze has no pre-trained path (~15 ms)
+
+_trainer = None  # (pid, executor): one background thread trains paths for every game in the process
+
+
+def request_trained_path(maze):
+    """Future of Inky's path on maze: the library's, or one trained off the game loop.
+
+    Regenerated mazes are new layouts, so most have no pre-trained path; a short GA
+    run on a background thread trains one from the cage exit, and the library keeps
+    it for every other game on the same maze. The GA is seeded from the maze itself,
+    so the path is the same however and whenever it gets trained.
+    """
+    global _trainer
+    library = load_library()
+    start, digest = ghost_exit_tile(maze), maze_hash(maze)
+    path = library.get(maze, start, TRAINED_TARGET, digest)
+    if path is not None:
+        future = Future()
+        future.set_result(path)
+        return future
+    if _trainer is None or _trainer[0] != os.getpid():  # Threads don't survive a fork
+        _trainer = (os.getpid(), ThreadPoolExecutor(max_workers=1, thread_name_prefix='inky-path'))
+    snapshot = [row[:] for row in maze]  # The gate tile changes under the game loop
+    future = _trainer[1].submit(train_path, snapshot, start, TRAINED_TARGET, IN_PLAY_GENERATIONS,
+                                verbose=False, rng=random.Random(digest))
+    future.add_done_callback(
+        lambda done: done.cancelled() or library.put(snapshot, start, TRAINED_TARGET, done.result(), digest))
+    return future
+
 
 class Ghost:
-    def __init__(self, id, x, y, frames, tile_size, maze, gate):
+    def __init__(self, id, x, y, frames, tile_size, maze, gate, rng=random):
         self.id = id
         self.x = x
         self.y = y
         self.tile_size = tile_size
         self.frames = frames  # Dictionary of sprite lists for each direction
-        self.rect = pygame.Rect(self.x * tile_size, self.y * tile_size, tile_size, tile_size)
+        self.rect = Rect(self.x * tile_size, self.y * tile_size, tile_size, tile_size)
         self.maze = maze
         self.gate = gate
 
@@ -21,25 +61,57 @@ class Ghost:
         self.frame_counter = 0
         self.last_pos = None
         self.bumped_this_frame = False
+        self.planned_move = None  # Next tile handed down by a cooperative planner, if any
+        self.occupancy = None  # Shared OccupancyGrid of ghosts, if the game uses one
+        self.occupied_tile = None
+        self.mcts = None  # MCTSPlanner, built on first use for id 5
+        self.rng = rng  # Random moves and MCTS rollouts; the game's own RNG keeps seeded games reproducible
 
-        # Load pre-trained path for Clyde
-        if self.id == 4:
-            try:
-                with open("trained_clyde_path.txt", "r") as f:
-                    self.trained_path = eval(f.read())
-            except FileNotFoundError:
-                print("Trained path not found. Using random movement.")
-                self.trained_path = []
+        # Inky's trained path for the current maze, handed over by the game, and how far along it is
+        self.trained_path = []
+        self.path_index = 0
 
     def tile_position(self):
         """Return the current tile position of the ghost."""
         return (self.rect.x // self.tile_size, self.rect.y // self.tile_size)
 
-    def draw(self, surface):
-        """Draw the ghost's sprite on the screen."""
+    def next_trained_step(self):
+        """Next tile towards the trained path's current waypoint, or None once it's walked.
+
+        Waypoints are passed once the ghost stands exactly on them; one that isn't next
+        door (the path starts at the cage exit) is reached by BFS, or in a straight line
+        like any other move_along_path target if the ghost was pushed out of the cage
+        onto a wall tile that BFS can't start from.
+        """
+        path, tile_size = self.trained_path, self.tile_size
+        while (self.path_index < len(path) and self.rect.x == path[self.path_index][0] * tile_size
+               and self.rect.y == path[self.path_index][1] * tile_size):
+            self.path_index += 1
+        if self.path_index >= len(path):
+            return None
+        waypoint = path[self.path_index]
+        x, y = self.tile_position()
+        if abs(waypoint[0] - x) + abs(waypoint[1] - y) <= 1:
+            return waypoint
+        route = bfs((x, y), waypoint, self.maze)
+        return route[0] if route else waypoint
+
+    def sync_occupancy(self):
+        """Tell the occupancy grid if the ghost's rect has crossed into another tile."""
+        if self.occupancy is None:
+            return
+        tile = self.tile_position()
+        if tile != self.occupied_tile:
+            self.occupancy.move(self, self.occupied_tile, tile)
+            self.occupied_tile = tile
+
+    def draw(self, surface, offset=(0, 0)):
+        """Draw the ghost's sprite on the screen, shifted by the camera offset."""
+        import pygame  # Rendering only; headless games never load pygame
+
         sprite = self.frames[self.direction_name][self.current_frame]
         sprite = pygame.transform.scale(sprite, (self.tile_size, self.tile_size))
-        surface.blit(sprite, self.rect.topleft)
+        surface.blit(sprite, (self.rect.x - offset[0], self.rect.y - offset[1]))
 
     def is_walkable(self, x, y):
         """Check if a tile is walkable."""
@@ -50,7 +122,7 @@ class Ghost:
         if not self.has_escaped:
             gate_tile = (self.gate.gate_rect.centerx // self.tile_size,
                          self.gate.gate_rect.centery // self.tile_size)
-            distance_to_gate = pygame.Vector2(x, y).distance_to(gate_tile)
+            distance_to_gate = math.hypot(x - gate_tile[0], y - gate_tile[1])
             return distance_to_gate < 2  # Only allow movement near gate
 
         return True  # Free movement after escape
@@ -72,7 +144,7 @@ class Ghost:
                 # Check if reached gate tile to mark as escaped
                 if self.tile_position() == gate_tile:
                     self.has_escaped = True
-                    print(f"Ghost {self.id} escaped through the gate!")
+                    log.info("Ghost %s escaped through the gate!", self.id)
             else:
                 # Normal behavior when gate is intact
                 path_to_gate = bfs(self.tile_position(), gate_tile, self.maze)
@@ -87,13 +159,15 @@ class Ghost:
                         self.gate.hit()
                         self.gate.flicker_timer = 10
                         self.bumped_this_frame = True
-                        print(f"Ghost {self.id} attacked the gate! Hit {self.bump_count}/2")
+                        log.info("Ghost %s attacked the gate! Hit %s/2", self.id, self.bump_count)
 
         # After escape behavior
         if self.has_escaped:
-            if self.id == 1:  # Pinky - BFS to player1
+            if self.planned_move is not None:  # Cooperative plan overrides individual search
+                self.move_along_path([self.planned_move])
+            elif self.id == 1:  # Pinky - BFS to player1
                 path = bfs(self.tile_position(), pacman_positions[0], self.maze)
-                print(f"Pinky BFS Path: {path}")
+                log.debug("Pinky BFS Path: %s", path)
                 if path:
                     self.move_along_path(path)
             elif self.id == 2:  # Blinky - A* to player2
@@ -102,19 +176,28 @@ class Ghost:
                     self.move_along_path(path)
             elif self.id == 3:  # Clyde - Minimax
                 best_move = minimax_choose_move(self.tile_position(), pacman_positions[0], self.maze)
-                print(f"Clyde Minimax Move: {best_move}")
+                log.debug("Clyde Minimax Move: %s", best_move)
                 self.rect.x, self.rect.y = best_move[0] * self.tile_size, best_move[1] * self.tile_size
-            elif self.id == 4:  # Inky - Use pre-trained path or fallback to random movement
-                if self.trained_path:
-                    self.move_along_path(self.trained_path)
+            elif self.id == 4:  # Inky - Walk the trained path; random movement before it's ready and after
+                step = self.next_trained_step()
+                if step is not None:
+                    self.move_along_path([step])
                 else:
                     pos = self.random_move(self.tile_position())
                     self.rect.x, self.rect.y = pos[0] * self.tile_size, pos[1] * self.tile_size
+            elif self.id == 5:  # MCTS - rollouts over the whole team and both Pac-Men
+                if self.mcts is None or self.mcts.maze is not self.maze:
+                    self.mcts = MCTSPlanner(self.maze, rng=self.rng)
+                state = SimState.from_game(self.maze, pacman_positions, ghosts)
+                best_move = self.mcts.choose_move(state, ghosts.index(self))
+                self.move_along_path([best_move])
 
             # Prevent re-entering cage
             if self.gate.cage_rect.collidepoint(self.rect.center):
                 self.rect.y -= self.tile_size
 
+        self.sync_occupancy()
+
         # Update animation frame
         self.frame_counter += 1
         if self.frame_counter >= 5:  # Change frame every 5 updates
@@ -131,7 +214,7 @@ class Ghost:
 
         # Ensure the next tile is walkable
         if self.maze[next_tile[1]][next_tile[0]] != 0:
-            print(f"Invalid move detected at {next_tile}. Stopping movement.")
+            log.debug("Invalid move detected at %s. Stopping movement.", next_tile)
             return
 
         dx = target_x - self.rect.x
@@ -143,11 +226,10 @@ class Ghost:
         else:
             self.direction_name = 'down' if dy > 0 else 'up'
 
-        v = pygame.Vector2(dx, dy)
-        if v.length() > 0:
-            v = v.normalize()
-            self.rect.x += v.x * self.speed
-            self.rect.y += v.y * self.speed
+        length = math.hypot(dx, dy)
+        if length > 0:
+            self.rect.x += dx / length * self.speed
+            self.rect.y += dy / length * self.speed
 
         # Snap to tile-center if close
         if abs(self.rect.x - target_x) < self.speed:
@@ -155,13 +237,15 @@ class Ghost:
         if abs(self.rect.y - target_y) < self.speed:
             self.rect.y = target_y
 
+        self.sync_occupancy()
+
     def random_move(self, pos):
         """Perform random movement for Clyde if no valid path is available."""
         directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
-        random.shuffle(directions)
+        self.rng.shuffle(directions)
         valid_moves = []
         for dx, dy in directions:
             nx, ny = pos[0] + dx, pos[1] + dy
             if 0 <= nx < len(self.maze[0]) and 0 <= ny < len(self.maze) and self.maze[ny][nx] == 0:
                 valid_moves.append((nx, ny))
-        return random.choice(valid_moves) if valid_moves else pos
\ No newline at end of file
+        return self.rng.choice(valid_moves) if valid_moves else pos
\ No newline at end of file
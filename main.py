@@ -1,369 +1,166 @@
-import pygame
-import random
-from player import Player
-from ghosts2 import Ghost  # Updated import to match the new ghosts.py file
-from gate import Gate
-from collections import deque
-
-# Cage settings
-CAGE_COLOR = (0, 200, 255)  # Light blue for boundaries
-GATE_COLOR = (255, 255, 255)
-CAGE_RECT = pygame.Rect(180, 220, 160, 100)  # x, y, width, height
-GATE_Y = CAGE_RECT.y + CAGE_RECT.height - 2
-GATE_HIT_LIMIT = 4
-gate_hits = 0
-gate_broken = False
-gate_disturb_timer = 0
-ghosts_escaped = 0
-consumed_pellets = set()
-
-
-TELEPORTERS = {  # Define teleporter pairs (x1, y1): (x2, y2)
-    (2, 2): (18, 18),
-    (18, 2): (2, 18)
-}
-
-def handle_teleporters(entity):
-    for (x1, y1), (x2, y2) in TELEPORTERS.items():
-        if entity.x == x1 and entity.y == y1:
-            entity.x, entity.y = x2, y2
-        elif entity.x == x2 and entity.y == y2:
-            entity.x, entity.y = x1, y1
-
-
-def draw_scoreboard(surface, score, pellets_left, escaped_ghosts):
-    font = pygame.font.Font(None, 36)
-    score_text = font.render(f"Score: {score}", True, (255, 255, 255))
-    pellets_text = font.render(f"Pellets Left: {len(pellets_left)}", True, (255, 255, 255))
-    ghosts_text = font.render(f"Escaped Ghosts: {escaped_ghosts}", True, (255, 255, 255))
-    surface.blit(score_text, (10, 10))
-    surface.blit(pellets_text, (10, 50))
-    surface.blit(ghosts_text, (10, 90))
-
-def reserve_ghost_box():
-    # Calculating the center of the maze to place the ghost cage
-    mid_r, mid_c = ROWS // 2, COLS // 2
-    for r in range(mid_r - 1, mid_r + 2):
-        for c in range(mid_c - 2, mid_c + 3):
-            maze[r][c] = 0  # Make it a path (not wall)
-
-def draw_ghost_cage():
-    # Coordinates
-    mid_r, mid_c = ROWS // 2, COLS // 2
-    top = (mid_r - 1) * TILE
-    bottom = (mid_r + 2) * TILE
-    left = (mid_c - 2) * TILE
-    right = (mid_c + 3) * TILE
-
-    
-    # Mark cage walls as impassable (maze[y][x] = 2 for walls)
-    for r in range(mid_r - 1, mid_r + 3):  # Top and Bottom walls
-        maze[r][mid_c - 2] = 2  # Left wall
-        maze[r][mid_c + 3] = 2  # Right wall
-    for c in range(mid_c - 2, mid_c + 4):  # Left and Right walls
-        maze[mid_r - 1][c] = 2  # Top wall
-        maze[mid_r + 2][c] = 2  # Bottom wall
-    
-
-    # Cage boundaries (visual representation)
-    pygame.draw.line(win, CAGE_COLOR, (left, top), (right, top), 2)    # Top
-    pygame.draw.line(win, CAGE_COLOR, (left, bottom), (right, bottom), 2)  # Bottom
-    pygame.draw.line(win, CAGE_COLOR, (left, top), (left, bottom), 2)   # Left
-    pygame.draw.line(win, CAGE_COLOR, (right, top), (right, bottom), 2) # Right
-
-    # Draw gate only if not broken and tile is a path
-    gate_tile_r, gate_tile_c = GATE_TILE
-    if maze[gate_tile_r][gate_tile_c] == 0:  # Gate is walkable
-        gate_x = gate_tile_c * TILE
-        gate_y = gate_tile_r * TILE
-        flicker_color = GATE_COLOR
-        pygame.draw.line(win, flicker_color, (gate_x, gate_y), (gate_x + TILE, gate_y), 2)
-
-def remove_dead_ends(iterations=30):
-    for _ in range(iterations):
-        for r in range(1, ROWS-1):
-            for c in range(1, COLS-1):
-                if maze[r][c] == 0:
-                    neighbors = [(r+1, c), (r-1, c), (r, c+1), (r, c-1)]
-                    walls = [maze[nr][nc] for nr, nc in neighbors]
-                    if walls.count(1) == 3:  # It's a dead end
-                        random.shuffle(neighbors)
-                        for nr, nc in neighbors:
-                            if maze[nr][nc] == 1:
-                                maze[nr][nc] = 0
-                                break
-
-
-def generate_maze(r, c):
-    maze[r][c] = 0
-    dirs = [(0, 2), (0, -2), (2, 0), (-2, 0)]
-    random.shuffle(dirs)
-
-    for dr, dc in dirs:
-        nr, nc = r + dr, c + dc
-        if 0 <= nr < ROWS and 0 <= nc < COLS and maze[nr][nc] == 1:
-            maze[r + dr // 2][c + dc // 2] = 0
-            generate_maze(nr, nc)
-
-
-
-def regenerate_maze():
-    mid_r, mid_c = ROWS // 2, COLS // 2
-    global maze, pellets
-    maze = [[1 for _ in range(COLS)] for _ in range(ROWS)]
-    generate_maze(1, 1)
-    reserve_ghost_box()
-    remove_dead_ends(50)
-
-    '''
-    # Preserve cage walls
-    for r in range(mid_r - 1, mid_r + 3):
-        maze[r][mid_c - 2] = 2  # Left wall
-        maze[r][mid_c + 3] = 2  # Right wall
-    for c in range(mid_c - 2, mid_c + 4):
-        maze[mid_r - 1][c] = 2  # Top wall
-        maze[mid_r + 2][c] = 2  # Bottom wall
-    '''
-        
-    pellets = set((r, c) for r in range(ROWS) for c in range(COLS) if maze[r][c] == 0)
-    pellets -= consumed_pellets
-    for r, c in CAGE_TILES:
-        pellets.discard((r, c))
-    pellets.discard(GATE_TILE)
-
-
-def find_nearest_valid_position(maze, start_x, start_y):
-    """Find the nearest valid position in the maze."""
-    queue = deque([(start_x, start_y)])
-    visited = set([(start_x, start_y)])
-
-    while queue:
-        x, y = queue.popleft()
-
-        # Check if the current tile is walkable
-        if maze[y][x] == 0:
-            return (x, y)
-
-        # Explore neighboring tiles
-        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < len(maze[0]) and 0 <= ny < len(maze) and (nx, ny) not in visited:
-                visited.add((nx, ny))
-                queue.append((nx, ny))
-
-    # Fallback: If no valid position is found, return the start position
-    return (start_x, start_y)
-
-
-
-def draw_pellets():
-    for r, c in pellets:
-        pygame.draw.circle(win, (255, 255, 255), (c * TILE + TILE // 2, r * TILE + TILE // 2), 3)
-
-# Main function:
-ROWS, COLS = 21, 21  # Must be odd to have walls surrounding paths
-TILE = 25
-WIDTH, HEIGHT = COLS * TILE, ROWS * TILE
-CAGE_MID_ROW = ROWS // 2
-CAGE_MID_COL = COLS // 2
-CAGE_WIDTH = 5
-CAGE_HEIGHT = 3
-CAGE_TILES = [
-    (r, c)
-    for r in range(CAGE_MID_ROW - 1, CAGE_MID_ROW + 2)
-    for c in range(CAGE_MID_COL - 2, CAGE_MID_COL + 3)
-]
-
-
-FOG_COLOR = (0, 0, 0, 150)  # Semi-transparent black
-VISION_RADIUS = 5 * TILE  # Radius of visible area
-
-def draw_fog_of_vision():
-    fog_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-    fog_surface.fill(FOG_COLOR)
-
-    # Clear a circle around Player 1
-    pygame.draw.circle(fog_surface, (0, 0, 0, 0), (player1.x * TILE + TILE // 2, player1.y * TILE + TILE // 2), VISION_RADIUS)
-
-    # Clear a circle around Player 2
-    pygame.draw.circle(fog_surface, (0, 0, 0, 0), (player2.x * TILE + TILE // 2, player2.y * TILE + TILE // 2), VISION_RADIUS)
-
-    win.blit(fog_surface, (0, 0))
-
-gate_tile_x = WIDTH // 2
-gate_tile_y = HEIGHT // 2 + 2  # Example
-#gate = Gate(gate_tile_x, gate_tile_y, TILE)
-# Create a pygame.Rect object for the gate's position and size
-gate_rect = pygame.Rect(gate_tile_x, gate_tile_y, TILE, TILE)
-
-
-import pygame
-pygame.init()
-win = pygame.display.set_mode((WIDTH, HEIGHT))
-from sprite import load_sprite_sheet
-pacman_right, pacman2_right, ghost_frames = load_sprite_sheet()
-
-# Initialize all walls
-maze = [[1 for _ in range(COLS)] for _ in range(ROWS)]
-
-
-# Start maze generation from (1, 1)
-generate_maze(1, 1)
-reserve_ghost_box()
-remove_dead_ends(50)  # You can tweak the number for more/less loops
-
-gate = Gate(gate_rect, win, maze, TILE)
-GATE_TILE = (CAGE_MID_ROW + 2, CAGE_MID_COL)
-maze[GATE_TILE[0]][GATE_TILE[1]] = 0  # Make sure it's path
-
-# Initialize pellets
-pellets = set((r, c) for r in range(ROWS) for c in range(COLS) if maze[r][c] == 0)
-# Exclude ghost cage and gate tiles
-for r, c in CAGE_TILES:
-    pellets.discard((r, c))
-pellets.discard(GATE_TILE)
-
-# Players
-player1 = Player(1, 1, pacman_right, maze, TILE, {
-    'up': pygame.K_UP,
-    'down': pygame.K_DOWN,
-    'left': pygame.K_LEFT,
-    'right': pygame.K_RIGHT
-}, pellets)
-
-player2 = Player(COLS - 2, ROWS - 2, pacman2_right, maze, TILE, {
-    'up': pygame.K_w,
-    'down': pygame.K_s,
-    'left': pygame.K_a,
-    'right': pygame.K_d
-}, pellets)
-
-cage_barrier_broken = {
-    "broken": False,
-    "hits": 0,
-    "escaped_count": 0,
-    "escape_cooldown": 0  # frames before next ghost escapes
-}
-
-
-# Initialize ghosts with updated Ghost class
-ghosts = [
-    Ghost(2, COLS // 2 , ROWS // 2, ghost_frames['blinky'], TILE, maze, gate),  # Updated to use the new Ghost class
-    Ghost(4, COLS // 2-1, ROWS // 2, ghost_frames['inky'], TILE, maze, gate),
-    Ghost(1, COLS // 2+1, ROWS // 2, ghost_frames['pinky'], TILE, maze, gate),
-    Ghost(3, int(COLS // 2-1.7), int(ROWS // 2-0.75) , ghost_frames['clyde'], TILE, maze, gate)
-]
-
-
-center_x = len(maze[0]) // 2
-center_y = len(maze) // 2 + 1  # One row below cage center
-
-# Define gate rectangle (adjust width/height if needed)
-gate_rect = pygame.Rect(center_x * TILE, center_y * TILE, TILE, TILE)
-for ghost in ghosts:
-        ghost.gate_rect = gate_rect  # Set this to the correct Rect
-
-
-def draw():
-    #draw the maze
-    for y in range(ROWS):
-        for x in range(COLS):
-            color = (0, 0, 255) if maze[y][x] == 1 else (0, 0, 0)
-            pygame.draw.rect(win, color, (x*TILE, y*TILE, TILE, TILE))
-
-
-    # Draw pellets
-    draw_pellets()
-
-    draw_ghost_cage()
-    player1.draw(win)
-    player2.draw(win)
-    for ghost in ghosts:
-        ghost.draw(win)
-
-
-
-run = True
-print("Clyde tile:", COLS // 2, ROWS // 2 - 1)
-print("Maze tile at Clyde position:", maze[ROWS // 2 - 1][COLS // 2])
-
-while run:
-    pygame.time.delay(100)
-    keys = pygame.key.get_pressed()
-
-    if not pygame.key.get_focused():
-        continue
-
-    # Store player and ghost positions
-    stored_player1_pos = (player1.x, player1.y)
-    stored_player2_pos = (player2.x, player2.y)
-    stored_ghost_positions = [(ghost.x, ghost.y) for ghost in ghosts]
-
-    if pygame.time.get_ticks() % 30000 < 1000:  # Regenerate every 30 seconds
-        regenerate_maze()
-        # Players
-        player1 = Player(1, 1, pacman_right, maze, TILE, {
-            'up': pygame.K_UP,
-            'down': pygame.K_DOWN,
-            'left': pygame.K_LEFT,
-            'right': pygame.K_RIGHT
-        }, pellets)
+import time
+_START = time.perf_counter()  # Cold-start reference for --report-startup
 
-        player2 = Player(COLS - 2, ROWS - 2, pacman2_right, maze, TILE, {
-            'up': pygame.K_w,
-            'down': pygame.K_s,
-            'left': pygame.K_a,
-            'right': pygame.K_d
-        }, pellets)
-
-        # Reposition players
-        player1.x, player1.y = find_nearest_valid_position(maze, *stored_player1_pos)
-        player2.x, player2.y = find_nearest_valid_position(maze, *stored_player2_pos)
-
-        # Reposition ghosts
-        for i, ghost in enumerate(ghosts):
-            ghost.x, ghost.y = find_nearest_valid_position(maze, *stored_ghost_positions[i])
-
-
-        draw_scoreboard(win, player1.score, pellets, gate.ghosts_escaped)
-    # Inside the main game loop
-    #draw_fog_of_vision()
-
-    
-
-    # Inside the main game loop
-    handle_teleporters(player1)
-    handle_teleporters(player2)
-    for ghost in ghosts:
-        handle_teleporters(ghost)
-
-    player1.move(keys, (player2.x, player2.y))
-    player2.move(keys, (player1.x, player1.y))
-
-    player1.update()
-    player2.update()
-
-    player1.eat_pellet(consumed_pellets)
-    player2.eat_pellet(consumed_pellets)
-
-    # Add the pacman_positions argument when calling update
-    for ghost in ghosts:
-        pacman_positions = [(player1.x, player1.y), (player2.x, player2.y)]
-        ghost.update(ghosts, pacman_positions)
-       # ghost.draw(win)
-
-
-    gate.update_gate_visuals()
-
-   # gate.draw(win)
-
-    win.fill((0, 0, 0))
-    draw()
+import argparse
+import logging
+import random
+from game import Game, NOOP, UP, DOWN, LEFT, RIGHT
+
+FRAME_DELAY_MS = 100
+MIN_SIZE = 21  # The cage sits mid-maze and the fixed teleporter pairs reach tile (18, 18)
+
+
+def maze_size(value):
+    size = int(value)
+    if size < MIN_SIZE:
+        raise argparse.ArgumentTypeError(f"must be at least {MIN_SIZE}, got {size}")
+    return size
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Two-player Pac-Man with AI ghosts.")
+    parser.add_argument("--rows", type=maze_size, default=21, help="maze rows (rounded up to odd, at least 21)")
+    parser.add_argument("--cols", type=maze_size, default=21, help="maze columns (rounded up to odd, at least 21)")
+    parser.add_argument("--tile", type=int, default=25, help="tile size in pixels")
+    parser.add_argument("--window", type=int, nargs=2, default=(1000, 800), metavar=("W", "H"),
+                        help="maximum window size; larger mazes scroll with the players")
+    parser.add_argument("--no-fog", action="store_true", help="disable fog of war")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--headless", action="store_true",
+                        help="no window: scripted Pac-Men play --ticks ticks")
+    parser.add_argument("--ticks", type=int, default=1000, help="ticks to simulate with --headless")
+    parser.add_argument("--policy", choices=("random", "greedy"), default="greedy",
+                        help="scripted Pac-Man policy for --headless")
+    parser.add_argument("--report-startup", action="store_true",
+                        help="print time to the first tick (headless) or first frame (windowed) and exit")
+    parser.add_argument("--resume", metavar="PATH", help="continue from a saved snapshot instead of a new game")
+    parser.add_argument("--autosave", metavar="PATH", help="periodically snapshot the game to PATH")
+    parser.add_argument("--autosave-every", type=int, default=600, metavar="TICKS",
+                        help="ticks between autosaves (600 = one minute in the window)")
+    parser.add_argument("-v", "--verbose", action="count", default=0,
+                        help="log ghost events (-v), plus every ghost decision each tick (-vv)")
+    return parser.parse_args(argv)
+
+
+def report_startup(mode, imports_done, ready):
+    print(f"{mode} cold start: {(ready - _START) * 1000:.1f} ms "
+          f"(imports {(imports_done - _START) * 1000:.1f} ms, setup {(ready - imports_done) * 1000:.1f} ms)")
+
+
+def new_or_resumed_game(args, **frames):
+    if args.resume:
+        from snapshot import load
+        return load(args.resume, **frames)
+    return Game(args.rows | 1, args.cols | 1, args.tile, seed=args.seed, **frames)
+
+
+def autosaver(args):
+    if not args.autosave:
+        return None
+    from snapshot import Autosaver
+    return Autosaver(args.autosave, args.autosave_every)
+
+
+def run_headless(args):
+    from policies import POLICIES
+    imports_done = time.perf_counter()
+
+    game = new_or_resumed_game(args)
+    policy = POLICIES[args.policy]
+    rng = random.Random(args.seed)
+    game.tick(policy(game, 0, rng), policy(game, 1, rng))
+    if args.report_startup:
+        report_startup("headless", imports_done, time.perf_counter())
+        return
+
+    saver = autosaver(args)
+    while game.tick_count < args.ticks and not game.done:
+        game.tick(policy(game, 0, rng), policy(game, 1, rng))
+        if saver:
+            saver.maybe_save(game)
+    if saver:  # Final save on the way out, so the next run can --resume from here
+        saver.save(game)
+        saver.close()
+    print(f"Ticks: {game.tick_count}  Pellets eaten: {game.pellets_eaten}  "
+          f"Captured at: {game.capture_tick}")
+
+
+def run_windowed(args):
+    # pygame and the sprite sheet are only loaded when there is something to draw
+    import pygame
+    from render import Renderer
+    from sprite import load_sprite_sheet
+    imports_done = time.perf_counter()
+
+    rows, cols, tile = args.rows | 1, args.cols | 1, args.tile  # Must be odd to have walls surrounding paths
+    pygame.init()
+    win = pygame.display.set_mode((min(args.window[0], cols * tile), min(args.window[1], rows * tile)))
+    pacman_right, pacman2_right, ghost_frames = load_sprite_sheet()
+
+    game = new_or_resumed_game(args, player_frames=(pacman_right, pacman2_right), ghost_frames=ghost_frames)
+    if (game.rows, game.cols, game.tile_size) != (rows, cols, tile):  # Resumed a differently sized game
+        win = pygame.display.set_mode((min(args.window[0], game.cols * game.tile_size),
+                                       min(args.window[1], game.rows * game.tile_size)))
+    renderer = Renderer(game, win, fog=not args.no_fog)
+    player_keys = [
+        [(pygame.K_UP, UP), (pygame.K_DOWN, DOWN), (pygame.K_LEFT, LEFT), (pygame.K_RIGHT, RIGHT)],
+        [(pygame.K_w, UP), (pygame.K_s, DOWN), (pygame.K_a, LEFT), (pygame.K_d, RIGHT)],
+    ]
+
+    def action(keys, bindings):
+        return next((a for key, a in bindings if keys[key]), NOOP)
+
+    renderer.draw()
     pygame.display.update()
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            run = False
-
-pygame.quit()
-
+    if args.report_startup:
+        report_startup("windowed", imports_done, time.perf_counter())
+        pygame.quit()
+        return
+
+    saver = autosaver(args)
+    run = True
+    while run:
+        pygame.time.delay(FRAME_DELAY_MS)
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                run = False
+            elif event.type == pygame.USEREVENT:  # Pellet animation speed-up has run out
+                pygame.time.set_timer(pygame.USEREVENT, 0)
+                for player in game.players:
+                    player.frame_delay = 5
+            elif event.type == pygame.USEREVENT + 1:  # Respawn timer from Player.be_killed
+                pygame.time.set_timer(pygame.USEREVENT + 1, 0)
+                game.respawn_players()
+
+        if not pygame.key.get_focused():
+            continue
+
+        keys = pygame.key.get_pressed()
+        game.tick(action(keys, player_keys[0]), action(keys, player_keys[1]))
+        if not game.pellets:  # Level cleared
+            game.reset()
+        if saver:
+            saver.maybe_save(game)
+
+        renderer.draw()
+        pygame.display.update()
+
+    if saver:  # Final save on the way out, so the next run can --resume from here
+        saver.save(game)
+        saver.close()
+    pygame.quit()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.verbose:
+        logging.basicConfig(level=logging.INFO if args.verbose == 1 else logging.DEBUG, format="%(message)s")
+    if args.headless:
+        run_headless(args)
+    else:
+        run_windowed(args)
+
+
+if __name__ == "__main__":
+    main()
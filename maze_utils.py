@@ -0,0 +1,194 @@
+import random
+from collections import deque
+
+# Tile values used throughout the game
+PATH = 0
+WALL = 1
+CAGE_WALL = 2
+
+TELEPORTERS = {  # Define teleporter pairs (x1, y1): (x2, y2)
+    (2, 2): (18, 18),
+    (18, 2): (2, 18)
+}
+
+
+def handle_teleporters(entity):
+    for (x1, y1), (x2, y2) in TELEPORTERS.items():
+        if entity.x == x1 and entity.y == y1:
+            entity.x, entity.y = x2, y2
+        elif entity.x == x2 and entity.y == y2:
+            entity.x, entity.y = x1, y1
+
+
+def cage_tiles(rows, cols):
+    """(row, col) tiles inside the ghost cage."""
+    mid_r, mid_c = rows // 2, cols // 2
+    return [
+        (r, c)
+        for r in range(mid_r - 1, mid_r + 2)
+        for c in range(mid_c - 2, mid_c + 3)
+    ]
+
+
+def gate_tile(rows, cols):
+    """(row, col) of the cage gate."""
+    return (rows // 2 + 2, cols // 2)
+
+
+def carve_maze(maze, r, c, rng=random):
+    """Iterative version of the recursive backtracker so large mazes don't hit the recursion limit."""
+    rows, cols = len(maze), len(maze[0])
+    maze[r][c] = PATH
+    stack = [(r, c, _shuffled_dirs(rng))]
+
+    while stack:
+        r, c, dirs = stack[-1]
+        if not dirs:
+            stack.pop()
+            continue
+        dr, dc = dirs.pop()
+        nr, nc = r + dr, c + dc
+        if 0 <= nr < rows and 0 <= nc < cols and maze[nr][nc] == WALL:
+            maze[r + dr // 2][c + dc // 2] = PATH
+            maze[nr][nc] = PATH
+            stack.append((nr, nc, _shuffled_dirs(rng)))
+
+
+def _shuffled_dirs(rng):
+    dirs = [(0, 2), (0, -2), (2, 0), (-2, 0)]
+    rng.shuffle(dirs)
+    # carve_maze pops from the end, so reverse to visit in shuffled order
+    dirs.reverse()
+    return dirs
+
+
+def reserve_ghost_box(maze):
+    # Calculating the center of the maze to place the ghost cage
+    for r, c in cage_tiles(len(maze), len(maze[0])):
+        maze[r][c] = PATH  # Make it a path (not wall)
+
+
+def build_cage_walls(maze):
+    """Mark cage walls as impassable (maze[y][x] = 2 for walls)."""
+    rows, cols = len(maze), len(maze[0])
+    mid_r, mid_c = rows // 2, cols // 2
+    for r in range(mid_r - 1, mid_r + 3):  # Top and Bottom walls
+        maze[r][mid_c - 2] = CAGE_WALL  # Left wall
+        maze[r][mid_c + 3] = CAGE_WALL  # Right wall
+    for c in range(mid_c - 2, mid_c + 4):  # Left and Right walls
+        maze[mid_r - 1][c] = CAGE_WALL  # Top wall
+        maze[mid_r + 2][c] = CAGE_WALL  # Bottom wall
+
+
+def remove_dead_ends(maze, iterations=30, rng=random):
+    rows, cols = len(maze), len(maze[0])
+    for _ in range(iterations):
+        opened = False
+        for r in range(1, rows - 1):
+            for c in range(1, cols - 1):
+                if maze[r][c] == PATH:
+                    neighbors = [(r+1, c), (r-1, c), (r, c+1), (r, c-1)]
+                    walls = [maze[nr][nc] for nr, nc in neighbors]
+                    if walls.count(WALL) == 3:  # It's a dead end
+                        opened = True
+                        rng.shuffle(neighbors)
+                        for nr, nc in neighbors:
+                            if maze[nr][nc] == WALL:
+                                maze[nr][nc] = PATH
+                                break
+        if not opened:  # Nothing changed, so every later pass would find the same nothing
+            break
+
+
+def new_maze(rows, cols, rng=random, dead_end_passes=50):
+    """Generate a maze the same way main.py does: carve, open the cage, then remove dead ends."""
+    maze = [[WALL for _ in range(cols)] for _ in range(rows)]
+    carve_maze(maze, 1, 1, rng)
+    reserve_ghost_box(maze)
+    remove_dead_ends(maze, dead_end_passes, rng)
+    gr, gc = gate_tile(rows, cols)
+    maze[gr][gc] = PATH  # Make sure it's path
+    return maze
+
+
+def ghost_exit_tile(maze):
+    """Where ghosts end up once pushed out of the cage: the walkable tile nearest the cage top."""
+    rows, cols = len(maze), len(maze[0])
+    mid_r, mid_c = rows // 2, cols // 2
+    # The cage box including its walls (see build_cage_walls); its inside is walkable too
+    cage = set((x, y) for y in range(mid_r - 1, mid_r + 3) for x in range(mid_c - 2, mid_c + 4))
+    return find_nearest_valid_position(maze, mid_c, mid_r - 2, avoid=cage)
+
+
+def initial_pellets(maze, consumed_pellets=()):
+    rows, cols = len(maze), len(maze[0])
+    pellets = set((r, c) for r in range(rows) for c in range(cols) if maze[r][c] == PATH)
+    pellets -= set(consumed_pellets)
+    # Exclude ghost cage and gate tiles
+    for r, c in cage_tiles(rows, cols):
+        pellets.discard((r, c))
+    pellets.discard(gate_tile(rows, cols))
+    return pellets
+
+
+def find_nearest_valid_position(maze, start_x, start_y, avoid=()):
+    """Find the nearest valid position in the maze, skipping (x, y) tiles in avoid."""
+    queue = deque([(start_x, start_y)])
+    visited = set([(start_x, start_y)])
+
+    while queue:
+        x, y = queue.popleft()
+
+        # Check if the current tile is walkable
+        if maze[y][x] == PATH and (x, y) not in avoid:
+            return (x, y)
+
+        # Explore neighboring tiles
+        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < len(maze[0]) and 0 <= ny < len(maze) and (nx, ny) not in visited:
+                visited.add((nx, ny))
+                queue.append((nx, ny))
+
+    # Fallback: If no valid position is found, return the start position
+    return (start_x, start_y)
+
+
+def pack_bits(flags):
+    """Pack an iterable of truthy values into bytes, 8 per byte, LSB first."""
+    out = bytearray()
+    byte = bit = 0
+    for flag in flags:
+        if flag:
+            byte |= 1 << bit
+        bit += 1
+        if bit == 8:
+            out.append(byte)
+            byte = bit = 0
+    if bit:
+        out.append(byte)
+    return bytes(out)
+
+
+def unpack_bits(data, count):
+    return [(data[i >> 3] >> (i & 7)) & 1 for i in range(count)]
+
+
+def pack_maze(maze):
+    """One bit per tile, set where the tile is walkable."""
+    return pack_bits(v == PATH for row in maze for v in row)
+
+
+def unpack_maze(data, rows, cols):
+    """Inverse of pack_maze; non-walkable tiles come back as plain walls (apply build_cage_walls as needed)."""
+    bits = unpack_bits(data, rows * cols)
+    return [[PATH if bits[r * cols + c] else WALL for c in range(cols)] for r in range(rows)]
+
+
+def pack_pellets(pellets, rows, cols):
+    return pack_bits((r, c) in pellets for r in range(rows) for c in range(cols))
+
+
+def unpack_pellets(data, rows, cols):
+    bits = unpack_bits(data, rows * cols)
+    return set((i // cols, i % cols) for i in range(rows * cols) if bits[i])
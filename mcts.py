@@ -0,0 +1,321 @@
+import math
+import random
+
+ROLLOUT_BUDGET = 200  # Rollouts per tick
+ROLLOUT_DEPTH = 20    # Tile steps simulated per rollout
+EXPLORATION = 1.4
+
+
+class SimState:
+    """Compact, immutable game snapshot for planning: tile tuples plus a shared maze reference.
+
+    Stepping returns a new state instead of mutating, so "cloning" is free and
+    thousands of rollouts never touch Player/Ghost objects or pygame Rects.
+    """
+    __slots__ = ('maze', 'players', 'ghosts', 'caught')
+
+    def __init__(self, maze, players, ghosts, caught=False):
+        self.maze = maze
+        self.players = players  # Tuple of (x, y) per Pac-Man
+        self.ghosts = ghosts    # Tuple of (x, y) per ghost
+        self.caught = caught
+
+    @classmethod
+    def from_game(cls, maze, pacman_positions, ghosts):
+        return cls(maze, tuple(pacman_positions), tuple(g.tile_position() for g in ghosts))
+
+    def step(self, player_moves, ghost_moves):
+        players = tuple(player_moves)
+        ghosts = tuple(ghost_moves)
+        caught = self.caught or any(g in players for g in ghosts)
+        # Head-on swaps count as a catch too
+        if not caught:
+            for old, new in zip(self.ghosts, ghosts):
+                if new in self.players and old in players:
+                    caught = True
+                    break
+        return SimState(self.maze, players, ghosts, caught)
+
+
+class NeighborTable:
+    """Walkable neighbours (including staying put) of every tile, built once per maze."""
+
+    def __init__(self, maze):
+        self.maze = maze
+        self.rows, self.cols = len(maze), len(maze[0])
+        self.table = {}
+
+    def __call__(self, tile):
+        moves = self.table.get(tile)
+        if moves is None:
+            moves = self.build(tile)
+        return moves
+
+    def build(self, tile):
+        x, y = tile
+        moves = [tile]
+        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.cols and 0 <= ny < self.rows and self.maze[ny][nx] == 0:
+                moves.append((nx, ny))
+        moves = self.table[tile] = tuple(moves)
+        return moves
+
+
+class DistanceTables:
+    """Per-target BFS distance and next-step tables over flat tile indices (y * cols + x).
+
+    Built lazily, the first time a tile is used as a chase/flee target, and kept for
+    the planner's lifetime: a rollout policy step becomes a couple of dict lookups
+    instead of Manhattan loops over every target. Each search stops `radius` steps out,
+    since anything farther cannot meet the target within a rollout anyway; that keeps
+    a table's cost independent of the maze size. The cache is dropped once it holds
+    max_cells entries.
+    """
+
+    def __init__(self, maze, radius, max_cells=1_000_000):
+        self.rows, self.cols = len(maze), len(maze[0])
+        self.radius = radius
+        self.far = radius + 1  # Distance reported for tiles beyond the radius
+        self.max_cells = max_cells
+        self.cells = 0
+        cols = self.cols
+        self.moves = []  # Tile index -> tuple of indices reachable in one step, staying put first
+        for i in range(self.rows * cols):
+            x, y = i % cols, i // cols
+            moves = [i]
+            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < cols and 0 <= ny < self.rows and maze[ny][nx] == 0:
+                    moves.append(ny * cols + nx)
+            self.moves.append(tuple(moves))
+        self.tables = {}
+
+    def __call__(self, target):
+        """(dist, toward) for target: dist[i] is the maze distance from i, toward[i] the next tile."""
+        entry = self.tables.get(target)
+        if entry is None:
+            if self.cells >= self.max_cells:
+                self.tables.clear()
+                self.cells = 0
+            entry = self.tables[target] = self.build(target)
+            self.cells += len(entry[0])
+        return entry
+
+    def build(self, target):
+        dist = {target: 0}
+        toward = {target: target}
+        moves = self.moves
+        frontier = [target]
+        for d in range(1, self.radius + 1):
+            next_frontier = []
+            for tile in frontier:
+                for n in moves[tile]:
+                    if n not in dist:
+                        dist[n] = d
+                        toward[n] = tile
+                        next_frontier.append(n)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return dist, toward
+
+
+def manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+class MCTSNode:
+    __slots__ = ('move', 'parent', 'children', 'visits', 'value', 'untried')
+
+    def __init__(self, move, parent, untried):
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.visits = 0
+        self.value = 0.0
+        self.untried = list(untried)
+
+    def best_child(self, c=EXPLORATION):
+        log_n = math.log(self.visits)
+        return max(self.children,
+                   key=lambda n: n.value / n.visits + c * math.sqrt(log_n / n.visits))
+
+
+class MCTSPlanner:
+    """Open-loop UCT over one ghost's moves; everyone else follows a cheap default policy.
+
+    Pac-Men mostly step away from the nearest ghost, the other ghosts mostly step
+    along a shortest path towards the nearest Pac-Man. A rollout scores 1 for a
+    catch, discounted by how long it took, otherwise a small bonus for ending close
+    to a Pac-Man. Internally tiles are flat indices into DistanceTables.
+    """
+
+    def __init__(self, maze, budget=ROLLOUT_BUDGET, depth=ROLLOUT_DEPTH, rng=None):
+        self.maze = maze
+        self.distances = DistanceTables(maze, 2 * depth)
+        self.cols = self.distances.cols
+        self.budget = budget
+        self.depth = depth
+        self.rng = rng or random.Random()
+        self.max_distance = len(maze) + len(maze[0])
+
+    def choose_move(self, state, ghost_index):
+        cols = self.cols
+        moves = self.distances.moves
+        sim = SimState(state.maze, tuple(y * cols + x for x, y in state.players),
+                       tuple(y * cols + x for x, y in state.ghosts), state.caught)
+        start = sim.ghosts[ghost_index]
+        root = MCTSNode(None, None, moves[start])
+
+        for _ in range(self.budget):
+            node, node_sim, depth = root, sim, 0
+
+            # Selection: walk down fully expanded nodes
+            while not node.untried and node.children and not node_sim.caught:
+                node = node.best_child()
+                node_sim = self.advance(node_sim, ghost_index, node.move)
+                depth += 1
+
+            # Expansion
+            if node.untried and not node_sim.caught:
+                move = node.untried.pop(self.rng.randrange(len(node.untried)))
+                node_sim = self.advance(node_sim, ghost_index, move)
+                depth += 1
+                child = MCTSNode(move, node, moves[move])
+                node.children.append(child)
+                node = child
+
+            reward = self.rollout(node_sim, ghost_index, depth)
+
+            # Backpropagation
+            while node is not None:
+                node.visits += 1
+                node.value += reward
+                node = node.parent
+
+        best = max(root.children, key=lambda n: n.visits).move if root.children else start
+        return (best % cols, best // cols)
+
+    def advance(self, state, ghost_index, own_move):
+        players, ghosts = state.players, state.ghosts
+        ghost_moves = [
+            own_move if i == ghost_index else self.chase_move(g, players)
+            for i, g in enumerate(ghosts)
+        ]
+        player_moves = [self.flee_move(p, ghosts) for p in players]
+        return state.step(player_moves, ghost_moves)
+
+    def rollout(self, state, ghost_index, depth):
+        """Play the default policies forward on plain lists of tile indices."""
+        steps = depth
+        caught = state.caught
+        players, ghosts = list(state.players), list(state.ghosts)
+        tables, moves = self.distances, self.distances.moves
+        cached = tables.tables.get
+        rand = self.rng.random
+        num_ghosts = len(ghosts)
+        far = tables.far
+
+        while not caught and steps < self.depth:
+            # Ghosts: own ghost walks randomly, the rest follow the nearest Pac-Man's shortest path.
+            # One uniform draw decides both "random step?" and which one (r / 0.2 is uniform too;
+            # the modulo only guards against rounding up to len).
+            player_tables = [cached(p) or tables(p) for p in players]
+            new_ghosts = []
+            for i in range(num_ghosts):
+                g = ghosts[i]
+                r = rand()
+                if i == ghost_index:
+                    tile_moves = moves[g]
+                    new_ghosts.append(tile_moves[int(r * len(tile_moves))])
+                elif r < 0.2:
+                    tile_moves = moves[g]
+                    new_ghosts.append(tile_moves[int(r * 5 * len(tile_moves)) % len(tile_moves)])
+                else:
+                    best_d = far
+                    for dist, toward in player_tables:
+                        d = dist.get(g, far)
+                        if d < best_d:
+                            best_d, best_toward = d, toward
+                    if best_d == far:  # Nobody within reach: wander
+                        tile_moves = moves[g]
+                        new_ghosts.append(tile_moves[int(r * len(tile_moves)) % len(tile_moves)])
+                    else:
+                        new_ghosts.append(best_toward[g])
+
+            # Pac-Men: step away from the nearest ghost. Maze distance is symmetric, so the
+            # Pac-Man's own table finds that ghost and only its table is needed for the moves.
+            new_players = []
+            for p, (own_dist, _) in zip(players, player_tables):
+                tile_moves = moves[p]
+                r = rand()
+                if r < 0.3:
+                    new_players.append(tile_moves[int(r / 0.3 * len(tile_moves)) % len(tile_moves)])
+                    continue
+                nearest_d = far
+                for g in new_ghosts:
+                    d = own_dist.get(g, far)
+                    if d < nearest_d:
+                        nearest_d, nearest_ghost = d, g
+                if nearest_d == far:  # No ghost within reach: wander
+                    new_players.append(tile_moves[int(r * len(tile_moves)) % len(tile_moves)])
+                    continue
+                nearest = (cached(nearest_ghost) or tables(nearest_ghost))[0]
+                best, best_d = p, -1
+                for m in tile_moves:
+                    d = nearest.get(m, far)
+                    if d > best_d:
+                        best, best_d = m, d
+                new_players.append(best)
+
+            steps += 1
+            for g in new_ghosts:
+                if g in new_players or g in players:  # Landing on or swapping through a Pac-Man
+                    caught = True
+                    break
+            players, ghosts = new_players, new_ghosts
+
+        if caught:
+            return 1.0 - 0.5 * steps / self.depth
+        cols = self.cols
+        closest = min(abs(g % cols - p % cols) + abs(g // cols - p // cols) for g in ghosts for p in players)
+        return 0.25 * (1.0 - closest / self.max_distance)
+
+    def chase_move(self, tile, targets):
+        if self.rng.random() < 0.2:
+            return self.rng.choice(self.distances.moves[tile])
+        far = self.distances.far
+        best_d, best_toward = far, None
+        for target in targets:
+            dist, toward = self.distances(target)
+            d = dist.get(tile, far)
+            if d < best_d:
+                best_d, best_toward = d, toward
+        if best_toward is None:
+            return self.rng.choice(self.distances.moves[tile])
+        return best_toward[tile]
+
+    def flee_move(self, tile, chasers):
+        moves = self.distances.moves[tile]
+        if self.rng.random() < 0.3:
+            return self.rng.choice(moves)
+        far = self.distances.far
+        own_dist = self.distances(tile)[0]
+        nearest = min(chasers, key=lambda c: own_dist.get(c, far))
+        if nearest not in own_dist:
+            return self.rng.choice(moves)
+        nearest = self.distances(nearest)[0]
+        best, best_d = tile, -1
+        for m in moves:
+            d = nearest.get(m, far)
+            if d > best_d:
+                best, best_d = m, d
+        return best
+
+
+def mcts_choose_move(ghost_pos, pacman_positions, ghost_positions, maze, budget=ROLLOUT_BUDGET):
+    """One-off planning call; reuse an MCTSPlanner to keep its neighbour table across ticks."""
+    ghosts = tuple(ghost_positions)
+    state = SimState(maze, tuple(pacman_positions), ghosts)
+    return MCTSPlanner(maze, budget).choose_move(state, ghosts.index(ghost_pos))
@@ -0,0 +1,523 @@
+import asyncio
+import contextlib
+import random
+import statistics
+import struct
+import time
+from collections import deque
+from game import REGENERATE_TICKS, Game, NOOP, UP, DOWN, LEFT, RIGHT
+from maze_utils import pack_maze, pack_pellets, unpack_maze, unpack_pellets
+
+# Wire format: every message is a uint32 length prefix followed by the payload.
+# Server -> client payloads start with a type byte:
+#   WELCOME  slot, session id
+#   FULL     tick, rows, cols, maze bits, pellet bits, every entity tile, every player status
+#   DELTA    tick, moved entities, eaten pellets, changed player statuses
+#   DONE     final tick, whether the game was played out (False: the other player left
+#            or the server stopped); the server closes the connection right after
+# Client -> server payloads are a single action byte.
+WELCOME, FULL, DELTA, DONE = range(4)
+LENGTH = struct.Struct('<I')
+WELCOME_MSG = struct.Struct('<BBI')
+DONE_MSG = struct.Struct('<BI?')
+FULL_HEADER = struct.Struct('<BIHH')
+DELTA_HEADER = struct.Struct('<BIH')  # Moved count: games can have hundreds of ghosts
+TILE = struct.Struct('<HH')
+MOVED = struct.Struct('<HHH')
+COUNT8 = struct.Struct('<B')
+COUNT16 = struct.Struct('<H')
+STATUS = struct.Struct('<BIB')  # player index, score, alive
+
+TICK_RATE = 10  # main.py runs at 100ms per tick
+TICK_SAMPLES = 10000  # Recent server tick times kept for stats
+BENCH_REGENERATE_TICKS = 20  # Short enough that every benchmark session regenerates its maze
+
+
+def frame(payload):
+    return LENGTH.pack(len(payload)) + payload
+
+
+def entity_tiles(game):
+    return [(p.x, p.y) for p in game.players] + [g.tile_position() for g in game.ghosts]
+
+
+def player_statuses(game):
+    return [(p.score, p.alive) for p in game.players]
+
+
+# --- Server ---
+class Session:
+    """One authoritative game plus what its two clients were last told about it."""
+
+    def __init__(self, session_id, seed, game_kwargs):
+        self.session_id = session_id
+        # Sessions that start together would otherwise all regenerate on the same server tick
+        regenerate_ticks = game_kwargs.get('regenerate_ticks', REGENERATE_TICKS)
+        offset = session_id % regenerate_ticks if regenerate_ticks else 0
+        self.game = Game(seed=seed, regenerate_offset=offset, **game_kwargs)
+        self.writers = [None, None]
+        self.inputs = [NOOP, NOOP]
+        self.started = False  # Both players have joined at some point
+        self.over = False
+        self.sent_maze = None
+        self.sent_tiles = None
+        self.sent_statuses = None
+        self.sent_pellets = None
+
+    @property
+    def ready(self):
+        return all(self.writers)
+
+    @property
+    def finished(self):
+        """Played out, or abandoned: a player left mid-game, or the only one waiting did."""
+        if self.game.done or (self.started and not self.ready):
+            return True
+        return not self.started and not any(self.writers)
+
+    def encode(self):
+        """Full snapshot after a (re)generated maze, otherwise only what changed since the last send."""
+        game = self.game
+        tiles = entity_tiles(game)
+        statuses = player_statuses(game)
+
+        if game.maze is not self.sent_maze:
+            parts = [FULL_HEADER.pack(FULL, game.tick_count, game.rows, game.cols),
+                     pack_maze(game.maze), pack_pellets(game.pellets, game.rows, game.cols)]
+            parts += [TILE.pack(*t) for t in tiles]
+            parts += [STATUS.pack(i, score, alive) for i, (score, alive) in enumerate(statuses)]
+            payload = b''.join(parts)
+            self.sent_maze = game.maze
+            self.sent_pellets = set(game.pellets)
+        else:
+            moved = [(i, t) for i, (t, old) in enumerate(zip(tiles, self.sent_tiles)) if t != old]
+            # Only Pac-Men eat, so this tick's eaten pellets can only be under them
+            eaten = [(y, x) for x, y in tiles[:len(game.players)]
+                     if (y, x) in self.sent_pellets and (y, x) not in game.pellets]
+            self.sent_pellets.difference_update(eaten)
+            changed = [(i, s) for i, (s, old) in enumerate(zip(statuses, self.sent_statuses)) if s != old]
+
+            parts = [DELTA_HEADER.pack(DELTA, game.tick_count, len(moved))]
+            parts += [MOVED.pack(i, *t) for i, t in moved]
+            parts.append(COUNT16.pack(len(eaten)))
+            parts += [TILE.pack(*p) for p in eaten]
+            parts.append(COUNT8.pack(len(changed)))
+            parts += [STATUS.pack(i, score, alive) for i, (score, alive) in changed]
+            payload = b''.join(parts)
+
+        self.sent_tiles = tiles
+        self.sent_statuses = statuses
+        return payload
+
+
+class GameServer:
+    """Headless authoritative server: pairs connections into sessions and ticks them all.
+
+    Finished sessions are dropped from self.sessions once their clients have been told,
+    so only live games are kept; stats() counts traffic over every session ever run.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, tick_rate=TICK_RATE, seed=0, **game_kwargs):
+        self.host = host
+        self.port = port
+        self.tick_rate = tick_rate
+        self.seed = seed
+        self.game_kwargs = game_kwargs
+        self.sessions = []
+        self.waiting = None  # Session with one player connected
+        self.sessions_started = 0
+        self.sessions_finished = 0
+        self.full_bytes = 0
+        self.full_snapshots = 0
+        self.delta_bytes = 0
+        self.deltas = 0
+        self.slow_clients = 0  # Dropped for not reading fast enough
+        self.ticks = 0
+        self.tick_times = deque(maxlen=TICK_SAMPLES)  # Bounded: servers run for days
+        self.regen_tick_times = deque(maxlen=TICK_SAMPLES)  # Ticks where some session got a new maze
+        self.server = None
+        self.running = False
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.running = True
+        self.tick_task = asyncio.ensure_future(self.run())
+
+    async def stop(self):
+        """Stop ticking and tell every client; live sessions stay listed for inspection."""
+        self.running = False
+        await self.tick_task
+        self.server.close()
+        await self.server.wait_closed()
+        for session in self.sessions:
+            self.end_session(session)
+
+    async def handle_client(self, reader, writer):
+        if self.waiting is None:
+            session_id = self.sessions_started
+            self.sessions_started += 1
+            self.waiting = Session(session_id, self.seed + session_id, self.game_kwargs)
+            self.sessions.append(self.waiting)
+            session, slot = self.waiting, 0
+        else:
+            session, slot = self.waiting, 1
+            session.started = True
+            self.waiting = None
+        session.writers[slot] = writer
+        writer.write(frame(WELCOME_MSG.pack(WELCOME, slot, session.session_id)))
+
+        try:
+            while True:
+                (length,) = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+                payload = await reader.readexactly(length)
+                action = payload[0]
+                if action in (NOOP, UP, DOWN, LEFT, RIGHT):
+                    session.inputs[slot] = action
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            if session.writers[slot] is writer:
+                session.writers[slot] = None
+            if self.waiting is session:
+                self.waiting = None
+            writer.close()
+            with contextlib.suppress(Exception):
+                await writer.wait_closed()
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.tick_rate
+        next_tick = loop.time()
+        while self.running:
+            start = time.perf_counter()
+            written = []
+            regenerated = False
+            for session in self.sessions:
+                if session.ready and not session.game.done:
+                    regenerated |= self.tick_session(session)
+                    written += session.writers
+            live = []
+            for session in self.sessions:
+                if session.finished:
+                    self.end_session(session)
+                    self.sessions_finished += 1
+                else:
+                    live.append(session)
+            self.sessions = live
+            self.tick_times.append(time.perf_counter() - start)
+            if regenerated:
+                self.regen_tick_times.append(self.tick_times[-1])
+            self.ticks += 1
+
+            next_tick += interval
+            await self.flush(written, max(0.0, next_tick - loop.time()))
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+    def tick_session(self, session):
+        """Advance one session and send its update; returns whether its maze was regenerated."""
+        maze = session.game.maze
+        session.game.tick(*session.inputs)
+        payload = session.encode()
+        if payload[0] == FULL:
+            self.full_bytes += len(payload)
+            self.full_snapshots += 1
+        else:
+            self.delta_bytes += len(payload)
+            self.deltas += 1
+        message = frame(payload)
+        for writer in session.writers:
+            writer.write(message)
+        return session.game.maze is not maze
+
+    async def flush(self, writers, timeout):
+        """Backpressure: wait until this tick's writes drain, and drop clients that can't keep up.
+
+        drain() only blocks while a socket's buffer is over its high-water mark, so
+        normally this returns at once; a client still backed up when the next tick is
+        due is disconnected rather than stalling every other session or buffering
+        without bound.
+        """
+        backed_up = [w for w in writers if not w.is_closing() and w.transport.get_write_buffer_size()]
+        if not backed_up:
+            return
+        drains = {asyncio.ensure_future(w.drain()): w for w in backed_up}
+        done, pending = await asyncio.wait(drains, timeout=timeout)
+        for task in pending:
+            task.cancel()
+            drains[task].close()  # handle_client sees the connection drop and frees the slot
+            self.slow_clients += 1
+        for task in done:
+            if task.exception() is not None:  # Connection reset mid-write
+                drains[task].close()
+
+    def end_session(self, session):
+        """Tell both clients the game is over and hang up on them."""
+        if session.over:
+            return
+        session.over = True
+        if self.waiting is session:
+            self.waiting = None
+        message = frame(DONE_MSG.pack(DONE, session.game.tick_count, session.game.done))
+        for writer in session.writers:
+            if writer is not None and not writer.is_closing():
+                writer.write(message)
+                writer.close()
+
+    def stats(self):
+        ticks_ms = sorted(t * 1000 for t in self.tick_times) or [0.0]
+        regen_ms = [t * 1000 for t in self.regen_tick_times] or [0.0]
+        return {
+            'sessions': self.sessions_started,
+            'sessions_finished': self.sessions_finished,
+            'slow_clients_dropped': self.slow_clients,
+            'server_ticks': self.ticks,
+            'delta_bytes_per_tick': self.delta_bytes / max(self.deltas, 1),
+            'full_snapshot_bytes': self.full_bytes / max(self.full_snapshots, 1),
+            'tick_ms_p50': statistics.median(ticks_ms),
+            'tick_ms_p99': ticks_ms[min(len(ticks_ms) - 1, int(len(ticks_ms) * 0.99))],
+            'tick_ms_max': ticks_ms[-1],
+            'regen_ticks': len(self.regen_tick_times),
+            'regen_tick_ms_max': max(regen_ms),
+        }
+
+
+# --- Client ---
+class GameClient:
+    """Mirrors the server's state from snapshots and deltas; only ever sends inputs.
+
+    latency (seconds) delays both directions to simulate a remote connection.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.slot = None
+        self.session_id = None
+        self.done = False
+        self.completed = False  # Whether the game was played out, once done
+        self.tick = -1
+        self.rows = self.cols = 0
+        self.maze = None
+        self.pellets = set()
+        self.tiles = []
+        self.statuses = []
+        self.bytes_received = 0
+        self.full_snapshots = 0
+
+    async def connect(self, host, port):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self.inbox = deque()
+        self.outbox = deque()
+        self.wakeup = asyncio.Event()
+        self.tasks = [asyncio.ensure_future(self.receive()), asyncio.ensure_future(self.deliver())]
+        while self.slot is None:
+            await asyncio.sleep(0.001)
+
+    def send_action(self, action):
+        message = frame(bytes((action,)))
+        if not self.latency:
+            self.writer.write(message)
+            return
+        self.outbox.append((time.perf_counter() + self.latency, message))
+        self.wakeup.set()
+
+    async def receive(self):
+        try:
+            while True:
+                (length,) = LENGTH.unpack(await self.reader.readexactly(LENGTH.size))
+                payload = await self.reader.readexactly(length)
+                self.bytes_received += LENGTH.size + length
+                if not self.latency:
+                    self.apply(payload)
+                    continue
+                self.inbox.append((time.perf_counter() + self.latency, payload))
+                self.wakeup.set()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+
+    async def deliver(self):
+        """Release delayed messages in order once their simulated latency has passed."""
+        while True:
+            if not self.inbox and not self.outbox:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+            now = time.perf_counter()
+            while self.inbox and self.inbox[0][0] <= now:
+                self.apply(self.inbox.popleft()[1])
+            while self.outbox and self.outbox[0][0] <= now:
+                self.writer.write(self.outbox.popleft()[1])
+            due = [q[0][0] for q in (self.inbox, self.outbox) if q]
+            if due:
+                await asyncio.sleep(max(0.0, min(due) - now))
+
+    def apply(self, payload):
+        kind = payload[0]
+        if kind == WELCOME:
+            _, self.slot, self.session_id = WELCOME_MSG.unpack(payload)
+        elif kind == FULL:
+            self.apply_full(payload)
+        elif kind == DELTA:
+            self.apply_delta(payload)
+        elif kind == DONE:
+            _, self.tick, self.completed = DONE_MSG.unpack(payload)
+            self.done = True
+
+    def apply_full(self, payload):
+        _, self.tick, rows, cols = FULL_HEADER.unpack_from(payload)
+        self.rows, self.cols = rows, cols
+        offset = FULL_HEADER.size
+        size = (rows * cols + 7) // 8
+        self.maze = unpack_maze(payload[offset:offset + size], rows, cols)
+        self.pellets = unpack_pellets(payload[offset + size:offset + 2 * size], rows, cols)
+        offset += 2 * size
+        count = (len(payload) - offset - 2 * STATUS.size) // TILE.size
+        self.tiles = [TILE.unpack_from(payload, offset + i * TILE.size) for i in range(count)]
+        offset += count * TILE.size
+        self.statuses = [STATUS.unpack_from(payload, offset + i * STATUS.size)[1:] for i in range(2)]
+        self.full_snapshots += 1
+
+    def apply_delta(self, payload):
+        _, self.tick, moved = DELTA_HEADER.unpack_from(payload)
+        offset = DELTA_HEADER.size
+        for _ in range(moved):
+            i, x, y = MOVED.unpack_from(payload, offset)
+            self.tiles[i] = (x, y)
+            offset += MOVED.size
+        (eaten,) = COUNT16.unpack_from(payload, offset)
+        offset += COUNT16.size
+        for _ in range(eaten):
+            self.pellets.discard(TILE.unpack_from(payload, offset))
+            offset += TILE.size
+        (changed,) = COUNT8.unpack_from(payload, offset)
+        offset += COUNT8.size
+        for _ in range(changed):
+            i, score, alive = STATUS.unpack_from(payload, offset)
+            self.statuses[i] = (score, alive)
+            offset += STATUS.size
+
+    async def close(self):
+        for task in self.tasks:
+            task.cancel()
+        self.writer.close()
+        with contextlib.suppress(Exception):
+            await self.writer.wait_closed()
+
+
+# --- Localhost benchmark ---
+async def run_benchmark(sessions=20, seconds=5.0, latency=0.05, tick_rate=TICK_RATE, seed=0,
+                        regenerate_ticks=BENCH_REGENERATE_TICKS):
+    """Bot clients send random inputs; returns bandwidth, server tick time and mirror consistency.
+
+    Mazes regenerate every regenerate_ticks, so the tick times include regeneration ticks.
+    """
+    server = GameServer(tick_rate=tick_rate, seed=seed, regenerate_ticks=regenerate_ticks)
+    await server.start()
+    clients = []
+    for _ in range(sessions * 2):
+        client = GameClient(latency)
+        await client.connect(server.host, server.port)
+        clients.append(client)
+
+    rng = random.Random(seed)
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        for client in clients:
+            client.send_action(rng.choice((UP, DOWN, LEFT, RIGHT)))
+        await asyncio.sleep(1 / tick_rate)
+
+    await server.stop()
+    await asyncio.sleep(latency * 2 + 0.05)  # Let in-flight messages land
+
+    # Sessions that finished early are gone from the server; check the ones stop() ended
+    live = {session.session_id: session.game for session in server.sessions}
+    mismatches = not_notified = 0
+    for client in clients:
+        not_notified += not client.done
+        game = live.get(client.session_id)
+        if game is not None and (client.tiles != entity_tiles(game) or client.pellets != game.pellets):
+            mismatches += 1
+    for client in clients:
+        await client.close()
+
+    stats = server.stats()
+    stats['client_bytes_per_tick'] = statistics.fmean(c.bytes_received / max(c.tick, 1) for c in clients)
+    stats['mirror_mismatches'] = mismatches
+    stats['clients_without_done'] = not_notified
+    return stats
+
+
+def play(host='127.0.0.1', port=8765, tile=25):
+    """Minimal pygame client: arrow keys drive your Pac-Man, the server does everything else."""
+    import pygame
+
+    async def main():
+        client = GameClient()
+        await client.connect(host, port)
+        while client.maze is None:
+            await asyncio.sleep(0.01)
+        pygame.init()
+        win = pygame.display.set_mode((client.cols * tile, client.rows * tile))
+        pygame.display.set_caption(f"Pac-Man (player {client.slot + 1})")
+        colors = [(255, 255, 0), (0, 255, 255)] + [(255, 0, 0), (0, 255, 255), (255, 184, 255), (255, 184, 82)]
+        keys = [(pygame.K_UP, UP), (pygame.K_DOWN, DOWN), (pygame.K_LEFT, LEFT), (pygame.K_RIGHT, RIGHT)]
+        running = True
+        while running and not client.done:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+            pressed = pygame.key.get_pressed()
+            client.send_action(next((action for key, action in keys if pressed[key]), NOOP))
+
+            win.fill((0, 0, 0))
+            for y, row in enumerate(client.maze):
+                for x, value in enumerate(row):
+                    if value:
+                        pygame.draw.rect(win, (0, 0, 255), (x * tile, y * tile, tile, tile))
+            for r, c in client.pellets:
+                pygame.draw.circle(win, (255, 255, 255), (c * tile + tile // 2, r * tile + tile // 2), 3)
+            for (x, y), color in zip(client.tiles, colors):
+                pygame.draw.circle(win, color, (x * tile + tile // 2, y * tile + tile // 2), tile // 2 - 2)
+            pygame.display.update()
+            await asyncio.sleep(1 / TICK_RATE)
+        await client.close()
+        pygame.quit()
+
+    asyncio.run(main())
+
+
+async def serve(host, port, tick_rate):
+    server = GameServer(host, port, tick_rate)
+    await server.start()
+    print(f"Serving on {server.host}:{server.port}")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Networked two-player Pac-Man.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("serve", help="run a headless authoritative server")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--tick-rate", type=int, default=TICK_RATE)
+    p = sub.add_parser("play", help="join a server")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p = sub.add_parser("bench", help="many bot sessions on localhost with simulated latency")
+    p.add_argument("--sessions", type=int, default=20)
+    p.add_argument("--seconds", type=float, default=5.0)
+    p.add_argument("--latency", type=float, default=0.05, help="one-way delay in seconds")
+    p.add_argument("--tick-rate", type=int, default=TICK_RATE)
+    p.add_argument("--regenerate-ticks", type=int, default=BENCH_REGENERATE_TICKS)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        asyncio.run(serve(args.host, args.port, args.tick_rate))
+    elif args.command == "play":
+        play(args.host, args.port)
+    else:
+        stats = asyncio.run(run_benchmark(args.sessions, args.seconds, args.latency, args.tick_rate,
+                                          regenerate_ticks=args.regenerate_ticks))
+        for key, value in stats.items():
+            print(f"{key}: {value:.3f}" if isinstance(value, float) else f"{key}: {value}")
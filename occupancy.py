@@ -0,0 +1,150 @@
+class OccupancyGrid:
+    """Which entities stand on which tile, kept up to date as they move.
+
+    Entities register once and then report tile changes with move(), so asking
+    "who is on (x, y)" is a single dict lookup instead of a scan over every entity.
+    """
+
+    def __init__(self):
+        self.cells = {}  # (x, y) -> list of entities on that tile
+
+    def add(self, entity, tile):
+        self.cells.setdefault(tile, []).append(entity)
+
+    def remove(self, entity, tile):
+        occupants = self.cells.get(tile)
+        if not occupants:
+            return
+        try:
+            occupants.remove(entity)
+        except ValueError:
+            return
+        if not occupants:
+            del self.cells[tile]
+
+    def move(self, entity, old_tile, new_tile):
+        if old_tile == new_tile:
+            return
+        if old_tile is not None:
+            self.remove(entity, old_tile)
+        self.add(entity, new_tile)
+
+    def at(self, tile):
+        return self.cells.get(tile, ())
+
+    def occupied(self, tile, exclude=None):
+        """True if anyone other than exclude stands on tile."""
+        for entity in self.cells.get(tile, ()):
+            if entity is not exclude:
+                return True
+        return False
+
+    def clear(self):
+        self.cells.clear()
+
+    def __len__(self):
+        return sum(len(v) for v in self.cells.values())
+
+
+def benchmark(num_ghosts=500, num_players=2, ticks=2000, size=201, seed=0):
+    """Compare per-tick collision cost of pairwise checks vs grid lookups."""
+    import random
+    import time
+
+    class Walker:
+        def __init__(self, x, y):
+            self.x, self.y = x, y
+
+    rng = random.Random(seed)
+    ghosts = [Walker(rng.randrange(size), rng.randrange(size)) for _ in range(num_ghosts)]
+    players = [Walker(rng.randrange(size), rng.randrange(size)) for _ in range(num_players)]
+    steps = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+    moves = [[rng.choice(steps) for _ in ghosts] for _ in range(ticks)]
+
+    def walk(tick, grid=None):
+        for ghost, (dx, dy) in zip(ghosts, moves[tick]):
+            old = (ghost.x, ghost.y)
+            ghost.x = min(max(ghost.x + dx, 0), size - 1)
+            ghost.y = min(max(ghost.y + dy, 0), size - 1)
+            if grid is not None:
+                grid.move(ghost, old, (ghost.x, ghost.y))
+
+    start_positions = [(g.x, g.y) for g in ghosts]
+
+    hits = 0
+    start = time.perf_counter()
+    for tick in range(ticks):
+        walk(tick)
+        for player in players:
+            for ghost in ghosts:
+                if (ghost.x, ghost.y) == (player.x, player.y):
+                    hits += 1
+    pairwise = time.perf_counter() - start
+
+    for ghost, (x, y) in zip(ghosts, start_positions):
+        ghost.x, ghost.y = x, y
+    grid = OccupancyGrid()
+    for ghost in ghosts:
+        grid.add(ghost, (ghost.x, ghost.y))
+
+    grid_hits = 0
+    start = time.perf_counter()
+    for tick in range(ticks):
+        walk(tick, grid)
+        for player in players:
+            grid_hits += len(grid.at((player.x, player.y)))
+    gridded = time.perf_counter() - start
+
+    assert hits == grid_hits
+    return {'ghosts': num_ghosts, 'pairwise_s': pairwise, 'grid_s': gridded, 'collisions': hits}
+
+
+def stress_game(num_ghosts=200, ticks=150, size=21, seed=0):
+    """Real Game with num_ghosts ghosts: check the grid against every ghost's rect each tick.
+
+    Ghosts move through Ghost.update/move_along_path and report tiles via sync_occupancy;
+    Game.check_collisions resolves contacts from the grid. After every tick the grid's
+    answer for each Pac-Man tile must match a pairwise scan over all ghosts.
+    """
+    import random
+    import time
+    from game import Game
+    from policies import greedy_pellet_policy
+
+    game = Game(size | 1, size | 1, seed=seed, regenerate_ticks=0, ghost_ids=(1, 2) * (num_ghosts // 2) + (1,) * (num_ghosts % 2))
+    rng = random.Random(seed)
+    pairwise = gridded = 0.0
+    contacts = captures = 0
+    for _ in range(ticks):
+        game.tick(greedy_pellet_policy(game, 0, rng), greedy_pellet_policy(game, 1, rng))
+
+        tiles = [(p.x, p.y) for p in game.players]
+        start = time.perf_counter()
+        by_scan = [{g for g in game.ghosts if g.tile_position() == tile} for tile in tiles]
+        pairwise += time.perf_counter() - start
+        start = time.perf_counter()
+        by_grid = [set(game.ghost_grid.at(tile)) for tile in tiles]
+        gridded += time.perf_counter() - start
+
+        assert by_scan == by_grid
+        assert len(game.ghost_grid) == num_ghosts
+        contacts += sum(len(found) for found in by_grid)
+        captures += sum(not p.alive for p in game.players)
+        game.respawn_players()
+        if not game.pellets:
+            break
+    escaped = sum(g.has_escaped for g in game.ghosts)
+    return {'ghosts': num_ghosts, 'ticks': game.tick_count, 'pairwise_s': pairwise, 'grid_s': gridded,
+            'contacts': contacts, 'captures': captures, 'escaped': escaped}
+
+
+if __name__ == "__main__":
+    for n in (4, 100, 500):
+        result = benchmark(num_ghosts=n, num_players=n // 4 + 2, ticks=500)
+        print(f"{result['ghosts']:5d} ghosts: pairwise {result['pairwise_s']:.3f}s, "
+              f"grid {result['grid_s']:.3f}s ({result['collisions']} collisions)")
+    for n in (4, 100, 200):
+        result = stress_game(num_ghosts=n)
+        print(f"{result['ghosts']:5d} ghosts in a real game, {result['ticks']} ticks: "
+              f"pairwise {result['pairwise_s'] * 1000:.1f} ms, grid {result['grid_s'] * 1000:.1f} ms "
+              f"({result['contacts']} contacts, {result['captures']} captures, {result['escaped']} escaped)")
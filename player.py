@@ -1,4 +1,11 @@
-import pygame
+import sys
+
+
+def running_pygame():
+    """pygame if a window has been set up, else None; headless games never import it."""
+    pygame = sys.modules.get('pygame')
+    return pygame if pygame is not None and pygame.get_init() else None
+
 
 class Player:
     def __init__(self, x, y, frames, maze, tile_size, keys, pellets):
@@ -18,6 +25,8 @@ class Player:
         self.alive = True  # Player state: alive or dead
         self.power_up = False  # Power-up state for killing ghosts
         self.power_up_timer = 0  # Timer for power-up duration
+        self.occupancy = None  # Shared OccupancyGrid of players, if the game uses one
+        self.occupied_tile = None
 
     def move(self, keys_pressed, other_player_pos):
         dx, dy = 0, 0
@@ -37,11 +46,26 @@ class Player:
         new_x = self.x + dx
         new_y = self.y + dy
 
+        if self.occupancy is not None:
+            blocked = self.occupancy.occupied((new_x, new_y), exclude=self)
+        else:
+            blocked = (new_x, new_y) == other_player_pos
+
         # Ensure the new position is valid
-        if 0 <= new_y < len(self.maze) and 0 <= new_x < len(self.maze[0]) and (new_x, new_y) != other_player_pos:
+        if 0 <= new_y < len(self.maze) and 0 <= new_x < len(self.maze[0]) and not blocked:
             if self.maze[new_y][new_x] == 0:  # Path, not a wall
                 self.x = new_x
                 self.y = new_y
+                self.sync_occupancy()
+
+    def sync_occupancy(self):
+        """Tell the occupancy grid about a tile change (moves, teleports, respawns)."""
+        if self.occupancy is None:
+            return
+        tile = (self.x, self.y)
+        if tile != self.occupied_tile:
+            self.occupancy.move(self, self.occupied_tile, tile)
+            self.occupied_tile = tile
 
     '''
     def eat_pellet(self, pellets):
@@ -60,7 +84,9 @@ class Player:
             consumed_pellets.add((self.y, self.x))  # Track consumed pellets
             self.score += 10
             self.frame_delay = 3  # Speed up animation temporarily
-            pygame.time.set_timer(pygame.USEREVENT, 500)  # Reset animation speed after 500ms
+            pygame = running_pygame()
+            if pygame:  # No event timers when running headless
+                pygame.time.set_timer(pygame.USEREVENT, 500)  # Reset animation speed after 500ms
 
     def kill_ghost(self, ghost):
         """Kill a ghost if the player is in power-up mode."""
@@ -72,7 +98,9 @@ class Player:
         """Handle the player being killed by a ghost."""
         self.alive = False
         self.frame_timer = 0
-        pygame.time.set_timer(pygame.USEREVENT + 1, 2000)  # Respawn after 2 seconds
+        pygame = running_pygame()
+        if pygame:
+            pygame.time.set_timer(pygame.USEREVENT + 1, 2000)  # Respawn after 2 seconds
 
     def update(self):
         """Update the player's animation and power-up state."""
@@ -91,8 +119,10 @@ class Player:
             if self.power_up_timer <= 0:
                 self.power_up = False  # End power-up state
 
-    def draw(self, surface):
-        """Draw the player's sprite on the screen."""
+    def draw(self, surface, offset=(0, 0)):
+        """Draw the player's sprite on the screen, shifted by the camera offset."""
+        import pygame  # Rendering only
+
         if not self.frames:
             return
 
@@ -106,13 +136,15 @@ class Player:
         if sprite.get_size() != (self.tile_size, self.tile_size):
             sprite = pygame.transform.scale(sprite, (self.tile_size, self.tile_size))
 
-        offset = (self.tile_size - sprite.get_width()) // 2
+        pad = (self.tile_size - sprite.get_width()) // 2
+        px = self.x * self.tile_size - offset[0]
+        py = self.y * self.tile_size - offset[1]
 
         # Draw the sprite
-        surface.blit(sprite, (self.x * self.tile_size + offset, self.y * self.tile_size + offset))
+        surface.blit(sprite, (px + pad, py + pad))
 
         # Highlight the player during power-up
         if self.power_up:
-            pygame.draw.circle(surface, (255, 0, 0), (self.x * self.tile_size + self.tile_size // 2,
-                                                       self.y * self.tile_size + self.tile_size // 2),
+            pygame.draw.circle(surface, (255, 0, 0), (px + self.tile_size // 2,
+                                                       py + self.tile_size // 2),
                                self.tile_size // 2, 2)
\ No newline at end of file
@@ -0,0 +1,35 @@
+from collections import deque
+from game import NOOP, UP, DOWN, LEFT, RIGHT
+
+MOVES = {UP: (0, -1), DOWN: (0, 1), LEFT: (-1, 0), RIGHT: (1, 0)}
+
+
+def random_policy(game, player_index, rng):
+    return rng.choice((UP, DOWN, LEFT, RIGHT))
+
+
+def greedy_pellet_policy(game, player_index, rng):
+    """Step towards the nearest pellet (BFS over walkable tiles)."""
+    player = game.players[player_index]
+    maze, pellets = game.maze, game.pellets
+    start = (player.x, player.y)
+    queue = deque([(start, NOOP)])
+    visited = {start}
+
+    while queue:
+        (x, y), first_action = queue.popleft()
+        if (y, x) in pellets and (x, y) != start:
+            return first_action
+        for action, (dx, dy) in MOVES.items():
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < len(maze[0]) and 0 <= ny < len(maze) and maze[ny][nx] == 0 and (nx, ny) not in visited:
+                visited.add((nx, ny))
+                queue.append(((nx, ny), first_action if first_action != NOOP else action))
+
+    return random_policy(game, player_index, rng)
+
+
+POLICIES = {
+    'random': random_policy,
+    'greedy': greedy_pellet_policy,
+}
@@ -0,0 +1,132 @@
+import hashlib
+import mmap
+import os
+import struct
+from array import array
+from collections import OrderedDict
+
+# File layout (little endian):
+#   header: magic, version, entry count
+#   index:  one fixed-size record per entry (maze hash, start, target, data offset, tile count)
+#   data:   packed uint16 x, y pairs for every path, back to back
+MAGIC = b'GPTH'
+VERSION = 1
+HEADER = struct.Struct('<4sHI')
+INDEX_ENTRY = struct.Struct('<16s4HII')
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'trained_paths.bin')
+MAX_ADDED = 128  # Paths trained during play kept per process; every regenerated maze adds one
+
+
+def maze_hash(maze):
+    """16-byte digest of the maze's walkable layout (cage walls and plain walls hash the same)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(struct.pack('<HH', len(maze), len(maze[0])))
+    h.update(bytes(0 if v == 0 else 1 for row in maze for v in row))
+    return h.digest()
+
+
+class PathLibrary:
+    """Read-only view of a trained path file, memory-mapped with an in-memory index.
+
+    Opening reads only the header and index; a lookup is one dict hit plus decoding
+    that entry's tiles straight out of the mapping.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_added=MAX_ADDED):
+        self.path = path
+        self.max_added = max_added
+        self.index = {}  # (maze hash, start, target) -> (offset, tile count)
+        self.added = OrderedDict()  # LRU of paths put() in this process: (maze hash, start, target) -> tiles
+        self._file = None
+        self._map = None
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return
+
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} trained path library")
+        for i in range(count):
+            digest, sx, sy, tx, ty, offset, length = INDEX_ENTRY.unpack_from(
+                self._map, HEADER.size + i * INDEX_ENTRY.size)
+            self.index[(digest, (sx, sy), (tx, ty))] = (offset, length)
+
+    def __len__(self):
+        return len(self.index) + len(self.added)
+
+    def get(self, maze, start, target, digest=None):
+        """Trained tile path for this maze/start/target, or None. Pass digest to skip rehashing."""
+        key = (digest or maze_hash(maze), tuple(start), tuple(target))
+        entry = self.index.get(key)
+        if entry is None:
+            path = self.added.get(key)
+            if path is None:
+                return None
+            self.added.move_to_end(key)
+            return list(path)
+        offset, length = entry
+        coords = array('H')
+        coords.frombytes(self._map[offset:offset + 4 * length])
+        return list(zip(coords[0::2], coords[1::2]))
+
+    def put(self, maze, start, target, tiles, digest=None):
+        """Keep a path trained during play for later lookups; the file itself is left alone."""
+        self.added[(digest or maze_hash(maze), tuple(start), tuple(target))] = tuple(tiles)
+        if len(self.added) > self.max_added:
+            self.added.popitem(last=False)
+
+    def entries(self):
+        """Yield (key, path) for every stored path."""
+        for key, (offset, length) in self.index.items():
+            coords = array('H')
+            coords.frombytes(self._map[offset:offset + 4 * length])
+            yield key, list(zip(coords[0::2], coords[1::2]))
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = self._file = None
+
+
+def write_library(entries, path=DEFAULT_PATH):
+    """Write {(maze hash, start, target): [(x, y), ...]} atomically to path."""
+    entries = list(entries.items())
+    data_start = HEADER.size + len(entries) * INDEX_ENTRY.size
+    index = bytearray()
+    data = bytearray()
+    for (digest, start, target), tiles in entries:
+        coords = array('H', [v for tile in tiles for v in tile])
+        index += INDEX_ENTRY.pack(digest, *start, *target, data_start + len(data), len(tiles))
+        data += coords.tobytes()
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(entries)))
+        f.write(index)
+        f.write(data)
+    os.replace(tmp_path, path)
+    _libraries.pop(os.path.abspath(path), None)
+
+
+def add_paths(new_entries, path=DEFAULT_PATH):
+    """Merge (maze, start, target, tiles) records into the library file, replacing matching keys."""
+    library = PathLibrary(path)
+    entries = dict(library.entries())
+    library.close()
+    for maze, start, target, tiles in new_entries:
+        entries[(maze_hash(maze), tuple(start), tuple(target))] = tiles
+    write_library(entries, path)
+
+
+_libraries = {}
+
+
+def load_library(path=DEFAULT_PATH):
+    """Process-wide shared PathLibrary, so every ghost reuses one mapping and index."""
+    key = os.path.abspath(path)
+    library = _libraries.get(key)
+    if library is None:
+        library = _libraries[key] = PathLibrary(path)
+    return library
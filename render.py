@@ -0,0 +1,105 @@
+import pygame
+from fog import FogOfWar
+from viewport import Camera
+
+# Cage settings
+CAGE_COLOR = (0, 200, 255)  # Light blue for boundaries
+GATE_COLOR = (255, 255, 255)
+WALL_COLOR = (0, 0, 255)
+PELLET_COLOR = (255, 255, 255)
+
+FOG_PRECOMPUTE_TILES = 400  # Line-of-sight tiles filled per frame after a new maze (~10 ms)
+
+
+class Renderer:
+    """Draws a Game through a camera viewport; everything pygame-facing lives here."""
+
+    def __init__(self, game, win, fog=True):
+        self.game = game
+        self.win = win
+        self.tile = game.tile_size
+        self.camera = Camera(win.get_width(), win.get_height(), game.cols * self.tile, game.rows * self.tile)
+        self.use_fog = fog
+        self.fog = None
+        self.fog_maze = None
+        self.fog_ready = False  # Line of sight precomputed for every tile of fog_maze
+        self.font = pygame.font.Font(None, 36)
+
+    def draw(self):
+        game, win, tile = self.game, self.win, self.tile
+        camera = self.camera
+        # Both Pac-Men when they fit on screen, otherwise player 1 (or whoever is still alive)
+        following = [p for p in game.players if p.alive] or game.players
+        camera.follow([(p.x * tile, p.y * tile) for p in following], tile)
+        x0, y0, x1, y1 = camera.visible_tile_range(tile)
+        ox, oy = camera.offset
+
+        win.fill((0, 0, 0))
+
+        #draw the maze (walls only; the window is already cleared to black)
+        for y in range(y0, y1):
+            row = game.maze[y]
+            for x in range(x0, x1):
+                if row[x] == 1:
+                    pygame.draw.rect(win, WALL_COLOR, (x*tile - ox, y*tile - oy, tile, tile))
+
+        # Only look up pellets on tiles inside the view, not every pellet on the map
+        for r in range(y0, y1):
+            for c in range(x0, x1):
+                if (r, c) in game.pellets:
+                    pygame.draw.circle(win, PELLET_COLOR, (c * tile + tile // 2 - ox, r * tile + tile // 2 - oy), 3)
+
+        self.draw_ghost_cage()
+        for player in game.players:
+            if camera.sees(player.x * tile, player.y * tile, tile):
+                player.draw(win, camera.offset)
+        for ghost in game.ghosts:
+            if camera.sees(ghost.rect.x, ghost.rect.y, tile):
+                ghost.draw(win, camera.offset)
+
+        if self.use_fog:
+            self.draw_fog_of_vision()
+        self.draw_scoreboard()
+
+    def draw_ghost_cage(self):
+        game, tile = self.game, self.tile
+        mid_r, mid_c = game.rows // 2, game.cols // 2
+        ox, oy = self.camera.offset
+        top = (mid_r - 1) * tile - oy
+        bottom = (mid_r + 2) * tile - oy
+        left = (mid_c - 2) * tile - ox
+        right = (mid_c + 3) * tile - ox
+
+        # Cage boundaries (visual representation)
+        pygame.draw.line(self.win, CAGE_COLOR, (left, top), (right, top), 2)    # Top
+        pygame.draw.line(self.win, CAGE_COLOR, (left, bottom), (right, bottom), 2)  # Bottom
+        pygame.draw.line(self.win, CAGE_COLOR, (left, top), (left, bottom), 2)   # Left
+        pygame.draw.line(self.win, CAGE_COLOR, (right, top), (right, bottom), 2) # Right
+
+        # Draw gate only if not broken
+        if not game.gate.broken:
+            gate_rect = game.gate.gate_rect
+            gate_x, gate_y = gate_rect.x - ox, gate_rect.y + gate_rect.height - oy
+            pygame.draw.line(self.win, GATE_COLOR, (gate_x, gate_y), (gate_x + tile, gate_y), 2)
+
+    def draw_fog_of_vision(self):
+        game = self.game
+        if game.maze is not self.fog_maze:  # New maze: new line-of-sight table
+            self.fog = FogOfWar(game.maze, self.tile)
+            self.fog_maze = game.maze
+            self.fog_ready = False
+        if not self.fog_ready:  # Fill it over the first frames so large mazes don't stall one
+            self.fog_ready = self.fog.table.precompute(FOG_PRECOMPUTE_TILES)
+        # Only repaints tiles whose visibility changed since the last player move
+        self.fog.update([(p.x, p.y) for p in game.players])
+        self.fog.draw(self.win, self.camera.offset)
+
+    def draw_scoreboard(self):
+        game = self.game
+        lines = [
+            f"Score: {game.players[0].score}",
+            f"Pellets Left: {len(game.pellets)}",
+            f"Escaped Ghosts: {sum(g.has_escaped for g in game.ghosts)}",
+        ]
+        for i, line in enumerate(lines):
+            self.win.blit(self.font.render(line, True, (255, 255, 255)), (10, 10 + 40 * i))
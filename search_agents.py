@@ -1,23 +1,30 @@
-from collections import deque
+from bisect import bisect_right
+from collections import OrderedDict, deque
 import heapq
+from itertools import accumulate
 import random
 
 # --- BFS Algorithm ---
 def bfs(start, goal, maze):
-    queue = deque([(start, [])])
-    visited = set([start])
+    queue = deque([start])
+    parents = {start: None}  # Doubles as the visited set; paths are only built for the goal
     
     while queue:
-        (x, y), path = queue.popleft()
+        current = queue.popleft()
         
-        if (x, y) == goal:
-            return path
+        if current == goal:
+            path = []
+            while current != start:
+                path.append(current)
+                current = parents[current]
+            return path[::-1]
         
+        x, y = current
         for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
             nx, ny = x + dx, y + dy
-            if 0 <= nx < len(maze[0]) and 0 <= ny < len(maze) and maze[ny][nx] == 0 and (nx, ny) not in visited:
-                visited.add((nx, ny))
-                queue.append(((nx, ny), path + [(nx, ny)]))
+            if 0 <= nx < len(maze[0]) and 0 <= ny < len(maze) and maze[ny][nx] == 0 and (nx, ny) not in parents:
+                parents[(nx, ny)] = current
+                queue.append((nx, ny))
     
     return []
 
@@ -115,54 +122,59 @@ def minimax_choose_move(current_pos, pacman_pos, maze, depth=2):
 DIRECTIONS = ['up', 'down', 'left', 'right']
 
 class GhostDNA:
-    def __init__(self, gene_length=10):
-        self.genes = [random.choice(DIRECTIONS) for _ in range(gene_length)]
-        self.fitness = 0
+    def __init__(self, gene_length=10, rng=random):
+        self.rng = rng
+        self.genes = [rng.choice(DIRECTIONS) for _ in range(gene_length)]
+        self.fitness = None  # Not scored yet
 
     def crossover(self, partner):
-        child = GhostDNA(len(self.genes))
-        midpoint = random.randint(0, len(self.genes) - 1)
+        child = GhostDNA(0, self.rng)  # Genes come from the parents, no need to draw fresh ones
+        midpoint = self.rng.randint(0, len(self.genes) - 1)
         child.genes = self.genes[:midpoint] + partner.genes[midpoint:]
         return child
 
     def mutate(self, mutation_rate=0.1):
         for i in range(len(self.genes)):
-            if random.random() < mutation_rate:
-                self.genes[i] = random.choice(DIRECTIONS)
+            if self.rng.random() < mutation_rate:
+                self.genes[i] = self.rng.choice(DIRECTIONS)
+        self.fitness = None  # Genes may have changed
 
 class GeneticGhostAI:
-    def __init__(self, population_size=20, gene_length=10):
-        self.population = [GhostDNA(gene_length) for _ in range(population_size)]
+    def __init__(self, population_size=20, gene_length=10, rng=random):
+        self.rng = rng
+        self.population = [GhostDNA(gene_length, rng) for _ in range(population_size)]
         self.generation = 0
         self.best = None
 
     def evaluate(self, evaluate_fn):
+        """Score the DNA that hasn't been scored yet; the carried-over elite keeps its fitness."""
         for dna in self.population:
-            dna.fitness = evaluate_fn(dna.genes)
+            if dna.fitness is None:
+                dna.fitness = evaluate_fn(dna.genes)
         self.population.sort(key=lambda x: x.fitness, reverse=True)
         self.best = self.population[0]
 
     def evolve(self, mutation_rate=0.1):
         new_population = [self.best]  # Keep the best one
+        cumulative = list(accumulate(dna.fitness for dna in self.population))  # Once per generation
         while len(new_population) < len(self.population):
-            parent1 = self.select()
-            parent2 = self.select()
+            parent1 = self.select(cumulative)
+            parent2 = self.select(cumulative)
             child = parent1.crossover(parent2)
             child.mutate(mutation_rate)
             new_population.append(child)
         self.population = new_population
         self.generation += 1
 
-    def select(self):
-        total_fitness = sum(dna.fitness for dna in self.population)
+    def select(self, cumulative=None):
+        """Roulette-wheel pick; cumulative is the running fitness total, if already computed."""
+        if cumulative is None:
+            cumulative = list(accumulate(dna.fitness for dna in self.population))
+        total_fitness = cumulative[-1]
         if total_fitness == 0:
-            return random.choice(self.population)
-        pick = random.uniform(0, total_fitness)
-        current = 0
-        for dna in self.population:
-            current += dna.fitness
-            if current > pick:
-                return dna
+            return self.rng.choice(self.population)
+        pick = self.rng.uniform(0, total_fitness)
+        return self.population[min(bisect_right(cumulative, pick), len(self.population) - 1)]
 
 # Fitness function for Inky
 def calculate_fitness(path, ghost_pos, pacman_pos, maze):
@@ -180,4 +192,119 @@ def calculate_fitness(path, ghost_pos, pacman_pos, maze):
         # Reward approaching Pac-Man
         distance = abs(x - pacman_pos[0]) + abs(y - pacman_pos[1])
         score += 1 / (distance + 1)
-    return score
\ No newline at end of file
+    return score
+
+class FitnessCache:
+    """calculate_fitness for one (ghost_pos, pacman_pos, maze), memoized by whole genome.
+
+    A child that repeats an earlier genome costs a dict lookup instead of a walk; the
+    memo is an LRU of max_genomes entries. Pass an instance straight to
+    GeneticGhostAI.evaluate. Only worth it when genomes repeat often (low mutation
+    rates): at train_path's defaults most children are new, so it is off there.
+    """
+
+    def __init__(self, ghost_pos, pacman_pos, maze, max_genomes=4096):
+        self.ghost_pos = ghost_pos
+        self.pacman_pos = pacman_pos
+        self.maze = maze
+        self.max_genomes = max_genomes
+        self.genomes = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, genes):
+        key = tuple(genes)
+        score = self.genomes.get(key)
+        if score is not None:
+            self.genomes.move_to_end(key)
+            self.hits += 1
+            return score
+        self.misses += 1
+        score = self.genomes[key] = calculate_fitness(key, self.ghost_pos, self.pacman_pos, self.maze)
+        if len(self.genomes) > self.max_genomes:
+            self.genomes.popitem(last=False)
+        return score
+
+# --- Cooperative A* for multiple ghosts ---
+WAIT_AND_MOVES = [(0, 0), (0, 1), (1, 0), (0, -1), (-1, 0)]
+
+def distance_map(goal, maze):
+    """BFS outward from goal; maps every reachable tile to its true distance."""
+    dist = {goal: 0}
+    queue = deque([goal])
+    while queue:
+        x, y = queue.popleft()
+        d = dist[(x, y)] + 1
+        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < len(maze[0]) and 0 <= ny < len(maze) and maze[ny][nx] == 0 and (nx, ny) not in dist:
+                dist[(nx, ny)] = d
+                queue.append((nx, ny))
+    return dist
+
+def space_time_astar(start, goal, maze, dist, reserved, reserved_edges, window):
+    """A* over (x, y, t) that avoids reserved cells and swaps; returns tiles for t = 0..k."""
+    unreachable = len(maze) * len(maze[0])
+    h0 = dist.get(start, unreachable)
+    open_list = [(h0, h0, 0, start, 0)]
+    parents = {(start, 0): None}
+    best = (h0, 0, start)  # Fallback: closest approach if the goal can't be reached inside the window
+    counter = 0
+
+    while open_list:
+        _, h, _, (x, y), t = heapq.heappop(open_list)
+        if (x, y) == goal or t == window:
+            best = (h, t, (x, y))
+            break
+        if (h, t) < best[:2]:
+            best = (h, t, (x, y))
+
+        for dx, dy in WAIT_AND_MOVES:
+            nx, ny = x + dx, y + dy
+            nt = t + 1
+            if (dx or dy) and not (0 <= nx < len(maze[0]) and 0 <= ny < len(maze) and maze[ny][nx] == 0):
+                continue
+            if (nx, ny, nt) in reserved or ((x, y), (nx, ny), nt) in reserved_edges:
+                continue
+            if ((nx, ny), nt) in parents:
+                continue
+            parents[((nx, ny), nt)] = ((x, y), t)
+            nh = dist.get((nx, ny), unreachable)
+            counter += 1
+            heapq.heappush(open_list, (nt + nh, nh, counter, (nx, ny), nt))
+
+    _, t, tile = best
+    path = []
+    node = (tile, t)
+    while node:
+        path.append(node[0])
+        node = parents[node]
+    return path[::-1]
+
+def cooperative_astar(starts, goals, maze, window=8):
+    """Plan every ghost in one pass over a shared space-time reservation table.
+
+    Ghosts are planned in the given (priority) order; each reserves its path so later
+    ghosts route around it instead of stacking in the same corridor. Ghosts chasing the
+    same target share one backward BFS as their heuristic. Returns the next tile per ghost.
+    """
+    reserved = set()        # (x, y, t)
+    reserved_edges = set()  # (from, to, t): forbids head-on swaps through a reserved move
+    distance_maps = {}
+    next_moves = []
+
+    for start, goal in zip(starts, goals):
+        if goal not in distance_maps:
+            distance_maps[goal] = distance_map(goal, maze)
+        path = space_time_astar(start, goal, maze, distance_maps[goal], reserved, reserved_edges, window)
+
+        for t, (x, y) in enumerate(path):
+            reserved.add((x, y, t))
+        last_x, last_y = path[-1]
+        for t in range(len(path), window + 1):  # Keep holding the last tile for the rest of the window
+            reserved.add((last_x, last_y, t))
+        for t in range(1, len(path)):
+            reserved_edges.add((path[t], path[t - 1], t))
+
+        next_moves.append(path[1] if len(path) > 1 else start)
+    return next_moves
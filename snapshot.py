@@ -0,0 +1,210 @@
+import os
+import random
+import struct
+import threading
+from game import DIRECTIONS, HEADLESS_FRAMES, HEADLESS_GHOST_FRAMES, Game
+from maze_utils import build_cage_walls, pack_maze, pack_pellets, unpack_maze, unpack_pellets
+
+# File layout (little endian):
+#   header:  magic, version, rows, cols, tile size, regenerate ticks and offset, tick count,
+#            maze start tick, capture tick (-1 for none), cooperative flag, player count,
+#            ghost count
+#   rng:     the game's Mersenne Twister state (625 words) and gauss_next
+#   bits:    maze walkability, pellets left, pellets consumed; rows * cols bits each
+#   gate, then one fixed-size record per player and per ghost
+MAGIC = b'GSNP'
+VERSION = 4
+HEADER = struct.Struct('<4sHHHHIIIIi?BH')
+RNG_STATE = struct.Struct('<625I?d')
+GATE = struct.Struct('<HHHH?')
+PLAYER = struct.Struct('<hhBHHBI??i')
+GHOST = struct.Struct('<BiihhB??HBBB??hhH')
+AUTOSAVE_TICKS = 600  # One minute at main.py's 100 ms per tick
+
+
+def dumps(game):
+    """Serialize the whole game state to a compact binary blob."""
+    rows, cols = game.rows, game.cols
+    version, words, gauss = game.rng.getstate()
+    parts = [
+        HEADER.pack(MAGIC, VERSION, rows, cols, game.tile_size, game.regenerate_ticks or 0,
+                    game.regenerate_offset, game.tick_count, game.maze_tick,
+                    -1 if game.capture_tick is None else game.capture_tick, game.cooperative,
+                    len(game.players), len(game.ghosts)),
+        RNG_STATE.pack(*words, gauss is not None, gauss or 0.0),
+        pack_maze(game.maze),
+        pack_pellets(game.pellets, rows, cols),
+        pack_pellets(game.consumed_pellets, rows, cols),
+    ]
+    gate = game.gate
+    parts.append(GATE.pack(gate.hits, gate.hit_limit, gate.flicker_timer, gate.ghosts_escaped, gate.broken))
+    for p in game.players:
+        parts.append(PLAYER.pack(p.x, p.y, DIRECTIONS.index(p.direction), p.frame_delay, p.frame_timer,
+                                 p.current_frame, p.score, p.alive, p.power_up, p.power_up_timer))
+    for g in game.ghosts:
+        plan = g.planned_move or (0, 0)
+        parts.append(GHOST.pack(g.id, g.rect.x, g.rect.y, g.x, g.y, DIRECTIONS.index(g.direction_name),
+                                g.has_escaped, getattr(g, 'alive', True), g.bump_count, g.speed,
+                                g.current_frame, g.frame_counter, g.bumped_this_frame,
+                                g.planned_move is not None, *plan, g.path_index))
+    return b''.join(parts)
+
+
+def loads(blob, player_frames=(HEADLESS_FRAMES, HEADLESS_FRAMES), ghost_frames=HEADLESS_GHOST_FRAMES):
+    """Rebuild a Game from dumps() output, without generating a maze first."""
+    (magic, version, rows, cols, tile, regenerate_ticks, regenerate_offset, tick_count, maze_tick, capture_tick,
+     cooperative, player_count, ghost_count) = HEADER.unpack_from(blob, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"not a version {VERSION} game snapshot")
+    offset = HEADER.size
+
+    *words, has_gauss, gauss = RNG_STATE.unpack_from(blob, offset)
+    offset += RNG_STATE.size
+    rng = random.Random()
+    rng.setstate((3, tuple(words), gauss if has_gauss else None))
+
+    nbytes = (rows * cols + 7) // 8
+    maze = unpack_maze(blob[offset:offset + nbytes], rows, cols)
+    build_cage_walls(maze)  # Only walkability is stored; the cage is always in the same place
+    pellets = unpack_pellets(blob[offset + nbytes:offset + 2 * nbytes], rows, cols)
+    consumed = unpack_pellets(blob[offset + 2 * nbytes:offset + 3 * nbytes], rows, cols)
+    offset += 3 * nbytes
+
+    gate_fields = GATE.unpack_from(blob, offset)
+    offset += GATE.size
+    player_records = []
+    for _ in range(player_count):
+        player_records.append(PLAYER.unpack_from(blob, offset))
+        offset += PLAYER.size
+    ghost_records = []
+    for _ in range(ghost_count):
+        ghost_records.append(GHOST.unpack_from(blob, offset))
+        offset += GHOST.size
+
+    # Everything Game.__init__ sets up except the maze, which comes from the snapshot
+    game = Game(rows, cols, tile, regenerate_ticks=regenerate_ticks, player_frames=player_frames,
+                ghost_frames=ghost_frames, cooperative=cooperative,
+                ghost_ids=tuple(record[0] for record in ghost_records), build=False,
+                regenerate_offset=regenerate_offset)
+    game.rng = rng
+    game.tick_count = tick_count
+    game.maze_tick = maze_tick  # Before _populate, which asks for Inky's path due from this tick
+    game.capture_tick = None if capture_tick < 0 else capture_tick
+    game.consumed_pellets = consumed
+    game._populate(maze, pellets)
+
+    gate = game.gate
+    gate.hits, gate.hit_limit, gate.flicker_timer, gate.ghosts_escaped, gate.broken = gate_fields
+    for p, record in zip(game.players, player_records):
+        (p.x, p.y, direction, p.frame_delay, p.frame_timer, p.current_frame, p.score,
+         p.alive, p.power_up, p.power_up_timer) = record
+        p.direction = DIRECTIONS[direction]
+        p.sync_occupancy()
+    for g, record in zip(game.ghosts, ghost_records):
+        (_, g.rect.x, g.rect.y, g.x, g.y, direction, g.has_escaped, alive, g.bump_count, g.speed,
+         g.current_frame, g.frame_counter, g.bumped_this_frame, has_plan, plan_x, plan_y, g.path_index) = record
+        g.direction_name = DIRECTIONS[direction]
+        g.planned_move = (plan_x, plan_y) if has_plan else None
+        if not alive:
+            g.alive = False
+        g.sync_occupancy()
+    return game
+
+
+def write_snapshot(blob, path):
+    """Write blob to path atomically, so a crash mid-write leaves the previous save intact."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def save(game, path):
+    write_snapshot(dumps(game), path)
+
+
+def load(path, **frames):
+    with open(path, 'rb') as f:
+        return loads(f.read(), **frames)
+
+
+class Autosaver:
+    """Periodic snapshots with the disk write on a background thread.
+
+    The game is serialized on the caller's thread between ticks (a consistent state,
+    and cheap), then handed to a writer thread; if a write is still running when the
+    next snapshot arrives, only the newest one is kept.
+    """
+
+    def __init__(self, path, every=AUTOSAVE_TICKS):
+        self.path = path
+        self.every = every
+        self.saves = 0
+        self._pending = None
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='autosave', daemon=True)
+        self._thread.start()
+
+    def maybe_save(self, game):
+        """Call once per tick; snapshots every `every` ticks."""
+        if game.tick_count and game.tick_count % self.every == 0:
+            self.save(game)
+
+    def save(self, game):
+        blob = dumps(game)
+        with self._cond:
+            self._pending = blob
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                blob, self._pending = self._pending, None
+            if blob is None:  # Closed with nothing left to write
+                return
+            write_snapshot(blob, self.path)
+            self.saves += 1
+
+    def close(self):
+        """Finish any pending write and stop the writer thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Snapshot size and save/restore timings.")
+    parser.add_argument("--rows", type=int, default=21)
+    parser.add_argument("--cols", type=int, default=21)
+    parser.add_argument("--repeats", type=int, default=100)
+    args = parser.parse_args()
+
+    game = Game(args.rows | 1, args.cols | 1, seed=0)
+    start = time.perf_counter()
+    for _ in range(args.repeats):
+        blob = dumps(game)
+    dump_ms = (time.perf_counter() - start) * 1000 / args.repeats
+    start = time.perf_counter()
+    for _ in range(args.repeats):
+        loads(blob)
+    load_ms = (time.perf_counter() - start) * 1000 / args.repeats
+    start = time.perf_counter()
+    Game(args.rows | 1, args.cols | 1, seed=0)
+    new_ms = (time.perf_counter() - start) * 1000
+    print(f"{game.rows}x{game.cols}: {len(blob)} bytes, save {dump_ms:.2f} ms, restore {load_ms:.2f} ms "
+          f"(new game {new_ms:.1f} ms)")
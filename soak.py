@@ -0,0 +1,133 @@
+import random
+import sys
+import time
+import tracemalloc
+from array import array
+from game import Game
+from policies import POLICIES
+
+SAMPLE_EVERY = 10000     # Ticks per measurement window
+MAX_GROWTH_KB = 512      # Allowed memory a traced window may leave allocated, after the warm-up pair
+MAX_P99_RATIO = 3.0      # Allowed p99 tick latency vs. the warm-up window
+MAX_TICK_MS = 250.0      # Hard ceiling for any single tick, timed with tracemalloc off
+RESPAWN_TICKS = 20       # main.py respawns caught players after 2 s, i.e. 20 ticks of 100 ms
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+def soak(ticks=1_000_000, sample_every=SAMPLE_EVERY, policy='greedy', seed=0,
+         max_growth_kb=MAX_GROWTH_KB, max_p99_ratio=MAX_P99_RATIO, max_tick_ms=MAX_TICK_MS,
+         trace_frames=1, log=None, **game_kwargs):
+    """Drive one headless game for `ticks` ticks with scripted inputs and watch for drift.
+
+    Like the windowed loop, caught Pac-Men respawn RESPAWN_TICKS later and only a
+    cleared level starts a new one, so each level runs long enough to see its maze
+    regenerated again and again, as in a long play session. The run alternates
+    windows of sample_every ticks, because tracemalloc slows every allocation:
+    untraced windows time each tick and record the latency percentiles, and traced
+    windows record how much of the memory allocated during the window is still
+    held when it ends. The first pair of windows is the warm-up baseline; the run
+    fails if a later traced window keeps more than max_growth_kb, or if an untraced
+    window's p99 exceeds max_p99_ratio x the baseline p99, or any timed tick
+    exceeds max_tick_ms.
+    """
+    choose = POLICIES[policy]
+    rng = random.Random(seed)
+    game = Game(seed=seed, **game_kwargs)
+    levels = 1
+    respawns = 0
+    respawn_at = None  # Tick when caught players come back, as main.py's respawn timer
+    window = array('d', [0.0] * sample_every)
+    samples = []  # (tick, retained KB, p50 ms, p99 ms, max ms)
+    failures = []
+    top_growth = []
+    retained_kb = 0.0
+    baseline_p99 = None
+
+    for tick in range(ticks):
+        traced = (tick // sample_every) % 2 == 1
+        if traced and tick % sample_every == 0:
+            tracemalloc.start(trace_frames)
+        if not game.pellets:  # Level cleared
+            levels += 1
+            respawn_at = None
+            game.reset(rng.randrange(2 ** 31))
+        elif respawn_at is None:
+            if not all(p.alive for p in game.players):
+                respawn_at = tick + RESPAWN_TICKS
+        elif tick >= respawn_at:
+            respawns += 1
+            respawn_at = None
+            game.respawn_players()
+        a1 = choose(game, 0, rng)
+        a2 = choose(game, 1, rng)
+        start = time.perf_counter()
+        game.tick(a1, a2)
+        window[tick % sample_every] = (time.perf_counter() - start) * 1000
+
+        if (tick + 1) % sample_every:
+            continue
+        warm_up = tick < 2 * sample_every
+        if traced:
+            retained_kb = tracemalloc.get_traced_memory()[0] / 1024
+            stats = tracemalloc.take_snapshot().statistics('lineno')
+            tracemalloc.stop()
+            if not warm_up:
+                top_growth = [str(stat) for stat in stats[:5]]
+                if retained_kb > max_growth_kb:
+                    failures.append(f"{retained_kb:.1f} KB still held from the window ending at tick {tick + 1}")
+            continue
+        latencies = sorted(window)
+        sample = (tick + 1, retained_kb, percentile(latencies, 0.5), percentile(latencies, 0.99), latencies[-1])
+        samples.append(sample)
+        if log:
+            print("tick {:>9}: kept {:9.1f} KB  p50 {:.3f} ms  p99 {:.3f} ms  max {:.3f} ms".format(*sample),
+                  file=log)
+
+        if baseline_p99 is None:
+            baseline_p99 = sample[3]
+        elif sample[3] > baseline_p99 * max_p99_ratio:
+            failures.append(f"p99 {sample[3]:.3f} ms at tick {tick + 1} vs baseline {baseline_p99:.3f} ms")
+        if sample[4] > max_tick_ms:
+            failures.append(f"tick took {sample[4]:.3f} ms at tick {tick + 1}")
+
+    if tracemalloc.is_tracing():  # The run ended inside a traced window
+        tracemalloc.stop()
+
+    return {
+        'ticks': ticks,
+        'levels': levels,
+        'respawns': respawns,
+        'samples': samples,
+        'failures': failures,
+        'top_growth': top_growth,
+        'passed': not failures,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Endurance run: memory growth and tick-latency drift.")
+    parser.add_argument("--ticks", type=int, default=1_000_000)
+    parser.add_argument("--sample-every", type=int, default=SAMPLE_EVERY)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default='greedy')
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-growth-kb", type=float, default=MAX_GROWTH_KB)
+    parser.add_argument("--max-p99-ratio", type=float, default=MAX_P99_RATIO)
+    parser.add_argument("--max-tick-ms", type=float, default=MAX_TICK_MS)
+    args = parser.parse_args()
+
+    report = soak(args.ticks, args.sample_every, args.policy, args.seed,
+                  args.max_growth_kb, args.max_p99_ratio, args.max_tick_ms, log=sys.stderr)
+    print(f"{report['ticks']} ticks over {report['levels']} levels, {report['respawns']} respawns")
+    for line in report['top_growth']:
+        print(f"  growth: {line}")
+    for failure in report['failures']:
+        print(f"FAIL: {failure}")
+    print("PASS" if report['passed'] else "FAIL")
+    sys.exit(0 if report['passed'] else 1)
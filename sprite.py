@@ -1,12 +1,15 @@
+import os
 import pygame
 
+SPRITE_SHEET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "spritesheet.png")
+
 sprite_sheet = None
 pacman_right = []
 pacman2_right = []
 
 def load_sprite_sheet():
     global sprite_sheet
-    sprite_sheet = pygame.image.load("spritesheet.png").convert()
+    sprite_sheet = pygame.image.load(SPRITE_SHEET).convert()
     sprite_sheet.set_colorkey((255, 0, 255))  # Magenta transparency
 
     directions = ['right', 'left', 'up', 'down']
@@ -1,41 +1,77 @@
+import argparse
 import random
-from search_agents import GeneticGhostAI, calculate_fitness
-
-# Maze dimensions and layout (replace with your actual maze)
-ROWS, COLS = 21, 21
-maze = [[0 for _ in range(COLS)] for _ in range(ROWS)]  # Example maze
-
-# Ghost and Pac-Man positions
-ghost_pos = (10, 10)  # Replace with actual ghost position
-pacman_pos = (5, 5)   # Replace with actual Pac-Man position
-
-# Initialize GA
-genetic_ai = GeneticGhostAI(population_size=50, gene_length=20)
-
-# Train the GA
-for generation in range(100):  # Number of generations
-    def evaluate_fn(genes):
-        return calculate_fitness(genes, ghost_pos, pacman_pos, maze)
-
-    genetic_ai.evaluate(evaluate_fn)
-    genetic_ai.evolve(mutation_rate=0.1)
-
-    print(f"Generation {generation + 1}: Best Fitness = {genetic_ai.best.fitness}")
-
-# Save the best path
-best_path = []
-current_pos = ghost_pos
-for direction in genetic_ai.best.genes:
-    if direction == 'up' and current_pos[1] > 0 and maze[current_pos[1] - 1][current_pos[0]] == 0:
-        current_pos = (current_pos[0], current_pos[1] - 1)
-    elif direction == 'down' and current_pos[1] < len(maze) - 1 and maze[current_pos[1] + 1][current_pos[0]] == 0:
-        current_pos = (current_pos[0], current_pos[1] + 1)
-    elif direction == 'left' and current_pos[0] > 0 and maze[current_pos[1]][current_pos[0] - 1] == 0:
-        current_pos = (current_pos[0] - 1, current_pos[1])
-    elif direction == 'right' and current_pos[0] < len(maze[0]) - 1 and maze[current_pos[1]][current_pos[0] + 1] == 0:
-        current_pos = (current_pos[0] + 1, current_pos[1])
-    best_path.append(current_pos)
-
-# Save the trained path to a file
-with open("trained_clyde_path.txt", "w") as f:
-    f.write(str(best_path))
\ No newline at end of file
+from search_agents import FitnessCache, GeneticGhostAI, calculate_fitness
+from maze_utils import build_cage_walls, ghost_exit_tile, new_maze
+from policy_store import DEFAULT_PATH, add_paths
+
+TRAINED_TARGET = (1, 1)  # Trained paths lead from the cage exit to player 1's spawn
+
+
+def train_path(maze, ghost_pos, pacman_pos, generations=100, verbose=True, gene_length=20, rng=random,
+               cache=False):
+    # Initialize GA
+    genetic_ai = GeneticGhostAI(population_size=50, gene_length=gene_length, rng=rng)
+    if cache:  # Repeated genomes cost a lookup; pays off only at low mutation rates
+        evaluate_fn = FitnessCache(ghost_pos, pacman_pos, maze)
+    else:
+        evaluate_fn = lambda genes: calculate_fitness(genes, ghost_pos, pacman_pos, maze)
+
+    # Train the GA
+    for generation in range(generations):  # Number of generations
+        genetic_ai.evaluate(evaluate_fn)
+        genetic_ai.evolve(mutation_rate=0.1)
+
+        if verbose:
+            print(f"Generation {generation + 1}: Best Fitness = {genetic_ai.best.fitness}")
+    if verbose and cache:
+        print(f"Fitness cache: {evaluate_fn.hits} hits, {evaluate_fn.misses} misses")
+
+    # Turn the best genes into the tile path they walk
+    best_path = []
+    current_pos = ghost_pos
+    for direction in genetic_ai.best.genes:
+        if direction == 'up' and current_pos[1] > 0 and maze[current_pos[1] - 1][current_pos[0]] == 0:
+            current_pos = (current_pos[0], current_pos[1] - 1)
+        elif direction == 'down' and current_pos[1] < len(maze) - 1 and maze[current_pos[1] + 1][current_pos[0]] == 0:
+            current_pos = (current_pos[0], current_pos[1] + 1)
+        elif direction == 'left' and current_pos[0] > 0 and maze[current_pos[1]][current_pos[0] - 1] == 0:
+            current_pos = (current_pos[0] - 1, current_pos[1])
+        elif direction == 'right' and current_pos[0] < len(maze[0]) - 1 and maze[current_pos[1]][current_pos[0] + 1] == 0:
+            current_pos = (current_pos[0] + 1, current_pos[1])
+        best_path.append(current_pos)
+    return best_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train Inky's path with the GA and store it in the path library.")
+    parser.add_argument("--seeds", type=int, nargs="*", default=None,
+                        help="pre-train for the mazes game.Game(seed=...) generates; default trains on an empty maze")
+    parser.add_argument("--rows", type=int, default=21)
+    parser.add_argument("--cols", type=int, default=21)
+    parser.add_argument("--generations", type=int, default=100)
+    parser.add_argument("--gene-length", type=int, default=20, help="moves per genome (path length)")
+    parser.add_argument("--cache", action="store_true", help="memoize fitness by genome")
+    parser.add_argument("--output", default=DEFAULT_PATH)
+    args = parser.parse_args()
+
+    trained = []
+    if args.seeds is None:
+        # Empty example maze with fixed ghost and Pac-Man positions
+        maze = [[0 for _ in range(args.cols)] for _ in range(args.rows)]
+        ghost_pos, pacman_pos = (10, 10), (5, 5)
+        trained.append((maze, ghost_pos, pacman_pos, train_path(maze, ghost_pos, pacman_pos, args.generations,
+                                                                gene_length=args.gene_length, cache=args.cache)))
+    else:
+        for seed in args.seeds:
+            # Same maze Game(seed=seed) builds first
+            maze = new_maze(args.rows, args.cols, random.Random(seed))
+            build_cage_walls(maze)
+            ghost_pos = ghost_exit_tile(maze)
+            path = train_path(maze, ghost_pos, TRAINED_TARGET, args.generations, verbose=False,
+                              gene_length=args.gene_length, rng=random.Random(seed), cache=args.cache)
+            trained.append((maze, ghost_pos, TRAINED_TARGET, path))
+            print(f"Seed {seed}: trained {len(path)}-tile path from {ghost_pos}")
+
+    # Save the trained paths into the binary library
+    add_paths(trained, args.output)
+    print(f"Stored {len(trained)} path(s) in {args.output}")
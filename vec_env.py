@@ -0,0 +1,244 @@
+import multiprocessing as mp
+import os
+import random
+import statistics
+import time
+from game import GHOST_IDS, Game
+from policies import POLICIES
+
+NUM_PLAYERS = 2
+# --- Shared result arrays ---
+class SharedResults:
+    """Flat int32 arrays in shared memory, one slot per game; written by workers, read by the parent."""
+
+    def __init__(self, num_games, num_ghosts=len(GHOST_IDS), ctx=mp):
+        self.num_games = num_games
+        self.num_entities = NUM_PLAYERS + num_ghosts
+        self.actions = ctx.RawArray('i', num_games * NUM_PLAYERS)
+        self.positions = ctx.RawArray('i', num_games * self.num_entities * 2)
+        self.scores = ctx.RawArray('i', num_games * NUM_PLAYERS)
+        self.pellets_left = ctx.RawArray('i', num_games)
+        self.ticks = ctx.RawArray('i', num_games)
+        self.capture_tick = ctx.RawArray('i', num_games)  # -1 until a Pac-Man is caught
+        self.done = ctx.RawArray('b', num_games)
+
+    def write(self, i, game):
+        base = i * self.num_entities * 2
+        tiles = [(p.x, p.y) for p in game.players] + [g.tile_position() for g in game.ghosts]
+        for j, (x, y) in enumerate(tiles):
+            self.positions[base + 2 * j] = x
+            self.positions[base + 2 * j + 1] = y
+        for j, player in enumerate(game.players):
+            self.scores[i * NUM_PLAYERS + j] = player.score
+        self.pellets_left[i] = len(game.pellets)
+        self.ticks[i] = game.tick_count
+        self.capture_tick[i] = -1 if game.capture_tick is None else game.capture_tick
+        self.done[i] = game.done
+
+    def observation(self, i):
+        base = i * self.num_entities * 2
+        flat = self.positions[base:base + self.num_entities * 2]
+        return [(flat[k], flat[k + 1]) for k in range(0, len(flat), 2)]
+
+
+class GameSlice:
+    """The contiguous block of games owned by one worker."""
+
+    def __init__(self, results, start, stop, game_kwargs, policy, max_ticks):
+        self.results = results
+        self.start = start
+        self.stop = stop
+        self.game_kwargs = game_kwargs
+        self.policy = POLICIES[policy]
+        self.max_ticks = max_ticks
+        self.games = [None] * (stop - start)
+        self.rngs = [None] * (stop - start)
+
+    def reset(self, seeds):
+        for k, i in enumerate(range(self.start, self.stop)):
+            seed = seeds[i]
+            self.games[k] = Game(seed=seed, **self.game_kwargs)
+            self.rngs[k] = random.Random(seed)
+            self.results.write(i, self.games[k])
+
+    def step(self, use_policy):
+        actions = self.results.actions
+        for k, i in enumerate(range(self.start, self.stop)):
+            game = self.games[k]
+            if self.results.done[i]:
+                continue
+            if use_policy:
+                a1 = self.policy(game, 0, self.rngs[k])
+                a2 = self.policy(game, 1, self.rngs[k])
+            else:
+                a1, a2 = actions[i * NUM_PLAYERS], actions[i * NUM_PLAYERS + 1]
+            game.tick(a1, a2)
+            self.results.write(i, game)
+            if self.max_ticks and game.tick_count >= self.max_ticks:
+                self.results.done[i] = True
+
+
+def _worker(conn, game_slice):
+    while True:
+        cmd, arg = conn.recv()
+        if cmd == 'reset':
+            game_slice.reset(arg)
+        elif cmd == 'step':
+            game_slice.step(arg)
+        elif cmd == 'close':
+            break
+        conn.send(None)
+    conn.close()
+
+
+# --- Vectorized environment ---
+class VecGameEnv:
+    """N independent headless games stepped in lockstep across a pool of worker processes.
+
+    Each worker owns a contiguous slice of games and writes positions, scores and
+    episode state straight into shared arrays, so only tiny command messages cross
+    the pipes. num_workers=0 runs every game in-process.
+    """
+
+    def __init__(self, num_games, num_workers=None, policy='random', max_ticks=1000, **game_kwargs):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}; expected one of {sorted(POLICIES)}")
+        self.num_games = num_games
+        self.num_workers = min(num_games, os.cpu_count() or 1) if num_workers is None else num_workers
+        ctx = mp.get_context()
+        self.results = SharedResults(num_games, len(game_kwargs.get('ghost_ids', GHOST_IDS)), ctx)
+        self.slices = []
+        self.conns = []
+        self.procs = []
+
+        bounds = _split(num_games, max(self.num_workers, 1))
+        for start, stop in bounds:
+            game_slice = GameSlice(self.results, start, stop, game_kwargs, policy, max_ticks)
+            if self.num_workers == 0:
+                self.slices.append(game_slice)
+                continue
+            parent_conn, child_conn = ctx.Pipe()
+            proc = ctx.Process(target=_worker, args=(child_conn, game_slice), daemon=True)
+            proc.start()
+            self.conns.append(parent_conn)
+            self.procs.append(proc)
+
+    def _broadcast(self, cmd, arg):
+        if self.num_workers == 0:
+            for game_slice in self.slices:
+                getattr(game_slice, cmd)(arg)
+            return
+        for conn in self.conns:
+            conn.send((cmd, arg))
+        for conn in self.conns:
+            conn.recv()
+
+    def reset(self, seeds=None):
+        """Start a fresh game in every slot; returns per-game entity tiles."""
+        if seeds is None:
+            seeds = [random.randrange(2 ** 31) for _ in range(self.num_games)]
+        if len(seeds) != self.num_games:
+            raise ValueError(f"Expected {self.num_games} seeds, got {len(seeds)}")
+        self._broadcast('reset', list(seeds))
+        return [self.results.observation(i) for i in range(self.num_games)]
+
+    def step(self, actions=None):
+        """Advance every unfinished game one tick.
+
+        actions is a sequence of (player1_action, player2_action) per game, or None to
+        let each game's scripted policy choose. Returns (observations, scores, dones).
+        """
+        if actions is not None:
+            if len(actions) != self.num_games:
+                raise ValueError(f"Expected {self.num_games} action pairs, got {len(actions)}")
+            for i, (a1, a2) in enumerate(actions):
+                self.results.actions[i * NUM_PLAYERS] = a1
+                self.results.actions[i * NUM_PLAYERS + 1] = a2
+        self._broadcast('step', actions is None)
+
+        r = self.results
+        observations = [r.observation(i) for i in range(self.num_games)]
+        scores = [tuple(r.scores[i * NUM_PLAYERS:(i + 1) * NUM_PLAYERS]) for i in range(self.num_games)]
+        dones = [bool(d) for d in r.done]
+        return observations, scores, dones
+
+    def all_done(self):
+        return all(self.results.done)
+
+    def stats(self):
+        """Aggregate capture time and pellets eaten over the current batch."""
+        r = self.results
+        captures = [t for t in r.capture_tick if t >= 0]
+        pellets = [sum(r.scores[i * NUM_PLAYERS:(i + 1) * NUM_PLAYERS]) // 10 for i in range(self.num_games)]
+        return {
+            'games': self.num_games,
+            'total_ticks': sum(r.ticks),
+            'capture_rate': len(captures) / self.num_games,
+            'mean_capture_tick': statistics.fmean(captures) if captures else None,
+            'median_capture_tick': statistics.median(captures) if captures else None,
+            'mean_pellets_eaten': statistics.fmean(pellets),
+            'max_pellets_eaten': max(pellets),
+        }
+
+    def close(self):
+        for conn in self.conns:
+            conn.send(('close', None))
+        for proc in self.procs:
+            proc.join()
+        self.conns, self.procs = [], []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _split(n, parts):
+    size, extra = divmod(n, parts)
+    bounds, start = [], 0
+    for k in range(parts):
+        stop = start + size + (1 if k < extra else 0)
+        if stop > start:
+            bounds.append((start, stop))
+        start = stop
+    return bounds
+
+
+def run_batch(num_games, policy='random', max_ticks=1000, num_workers=None, seed=0, **game_kwargs):
+    """Play num_games to completion and return aggregate stats plus games/sec."""
+    seeds = [seed + i for i in range(num_games)]
+    with VecGameEnv(num_games, num_workers, policy, max_ticks, **game_kwargs) as env:
+        start = time.perf_counter()
+        env.reset(seeds)
+        while not env.all_done():
+            env.step()
+        elapsed = time.perf_counter() - start
+        stats = env.stats()
+    stats['seconds'] = elapsed
+    stats['games_per_sec'] = num_games / elapsed
+    stats['ticks_per_sec'] = stats['total_ticks'] / elapsed
+    return stats
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Batch-evaluate ghost AI over many headless games.")
+    parser.add_argument("--games", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default='greedy')
+    parser.add_argument("--max-ticks", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cooperative", action="store_true", help="plan escaped ghosts with cooperative A*")
+    parser.add_argument("--ghost-ids", type=int, nargs="+", default=None, metavar="ID",
+                        help="behavior id per ghost, any number of ghosts "
+                             "(1 BFS, 2 A*, 3 minimax, 4 trained path, 5 MCTS)")
+    args = parser.parse_args()
+
+    game_kwargs = {'cooperative': args.cooperative}
+    if args.ghost_ids:
+        game_kwargs['ghost_ids'] = tuple(args.ghost_ids)
+    stats = run_batch(args.games, args.policy, args.max_ticks, args.workers, args.seed, **game_kwargs)
+    for key, value in stats.items():
+        print(f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}")
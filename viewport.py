@@ -0,0 +1,50 @@
+class Camera:
+    """A window-sized view onto a (possibly much larger) maze, in world pixels."""
+
+    def __init__(self, view_width, view_height, world_width, world_height):
+        self.view_width = min(view_width, world_width)
+        self.view_height = min(view_height, world_height)
+        self.world_width = world_width
+        self.world_height = world_height
+        self.x = 0
+        self.y = 0
+
+    @property
+    def offset(self):
+        return (self.x, self.y)
+
+    def follow(self, points, size=0):
+        """Keep size x size boxes at the given world-pixel points on screen, clamped to the maze.
+
+        Points are in priority order: when they don't all fit in the view, the last ones
+        are dropped until the rest do, so the first point is always kept in view.
+        """
+        points = list(points)
+        while len(points) > 1 and not self.fits(points, size):
+            points.pop()
+        if not points:
+            return
+        x0, y0 = min(p[0] for p in points), min(p[1] for p in points)
+        x1, y1 = max(p[0] for p in points) + size, max(p[1] for p in points) + size
+        self.x = min(max((x0 + x1 - self.view_width) // 2, 0), self.world_width - self.view_width)
+        self.y = min(max((y0 + y1 - self.view_height) // 2, 0), self.world_height - self.view_height)
+
+    def fits(self, points, size=0):
+        """True if one view can hold every size x size box at these points."""
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        return (max(xs) - min(xs) + size <= self.view_width and
+                max(ys) - min(ys) + size <= self.view_height)
+
+    def visible_tile_range(self, tile_size):
+        """(x0, y0, x1, y1) tile bounds (end exclusive) that overlap the view."""
+        x0 = self.x // tile_size
+        y0 = self.y // tile_size
+        x1 = min(-(-(self.x + self.view_width) // tile_size), self.world_width // tile_size)
+        y1 = min(-(-(self.y + self.view_height) // tile_size), self.world_height // tile_size)
+        return x0, y0, x1, y1
+
+    def sees(self, px, py, size):
+        """True if a size x size box at world pixel (px, py) overlaps the view."""
+        return (px + size > self.x and px < self.x + self.view_width and
+                py + size > self.y and py < self.y + self.view_height)